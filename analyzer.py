@@ -3,8 +3,17 @@ from nltk.sentiment import SentimentIntensityAnalyzer
 from transformers import AutoTokenizer, AutoModel, pipeline
 import torch
 import numpy as np
-from typing import Dict, List, Union, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union, Optional
 import streamlit as st
+from aspects import AspectEngine, KeywordAutomaton
+from dedup import deduplicate_reviews
+from model_server import ModelServerUnavailable, get_client
 
 # Download required NLTK data
 try:
@@ -12,27 +21,269 @@ try:
 except LookupError:
     nltk.download('vader_lexicon')
 
-# Initialize BERT model and tokenizer
-tokenizer = AutoTokenizer.from_pretrained('bert-base-uncased')
-model = AutoModel.from_pretrained('bert-base-uncased')
+MODEL_NAME = 'bert-base-uncased'
+
+# BERT model and tokenizer, loaded on first in-process use. Processes served by
+# the shared model server (see model_server.py) never load them.
+tokenizer = None
+model = None
+_model_lock = threading.Lock()
+# Fast tokenizers are not safe to call from several threads at once
+_tokenizer_lock = threading.Lock()
+
+# Persisted anchor embeddings, rebuilt whenever the model or anchor phrases change
+ANCHOR_CACHE_PATH = 'anchor_embeddings.npz'
+
+# Phrases describing strong and weak values for each spec category
+FEATURE_ANCHORS = {
+    'battery': {
+        'positive': ['6000 mAh long lasting battery', '5000 mAh battery with fast charging', '120W super fast charging'],
+        'negative': ['3000 mAh small battery', 'slow 10W charging', 'battery drains quickly'],
+    },
+    'display': {
+        'positive': ['6.7 inch AMOLED display 120Hz refresh rate', 'full HD+ OLED screen high brightness', 'QHD+ LTPO display'],
+        'negative': ['HD+ LCD display 60Hz', 'low resolution TFT screen', 'dim display'],
+    },
+    'camera': {
+        'positive': ['108 MP main camera with optical image stabilization', '50 MP triple rear camera with telephoto', '4K video recording'],
+        'negative': ['8 MP single camera', '2 MP depth sensor', 'VGA front camera'],
+    },
+    'chipset': {
+        'positive': ['Snapdragon 8 Gen 2 octa core processor', 'MediaTek Dimensity 9200 chipset', 'Apple A17 Pro chip'],
+        'negative': ['quad core 1.3 GHz processor', 'MediaTek Helio A22', 'entry level chipset'],
+    },
+    'memory': {
+        'positive': ['12 GB RAM 256 GB storage', '16 GB LPDDR5X RAM', '512 GB UFS 4.0 storage'],
+        'negative': ['2 GB RAM 32 GB storage', '3 GB RAM', '16 GB eMMC storage'],
+    },
+    'design': {
+        'positive': ['IP68 water and dust resistant', 'lightweight 180 grams', 'premium glass and metal build'],
+        'negative': ['no water resistance', 'heavy 250 grams', 'plastic body'],
+    },
+    'connectivity': {
+        'positive': ['5G dual SIM Wi-Fi 6 Bluetooth 5.3 NFC', 'USB Type-C 3.2', 'Wi-Fi 7'],
+        'negative': ['4G only', 'micro USB port', 'Bluetooth 4.0 no NFC'],
+    },
+}
+
+# Mean-pooled BERT vectors are all fairly similar to each other, so relevance is judged by how
+# much closer a spec is to its best category than to the average category. Specs whose gap is
+# below this fraction of the gap the anchors themselves show (e.g. "ASIN: ...") are ignored.
+FEATURE_RELEVANCE_FRACTION = 0.5
+# Stretches the small cosine margins between positive and negative anchors
+FEATURE_MARGIN_SCALE = 10.0
+SPEC_EMBEDDING_CACHE_SIZE = 256
+# Products whose review deduplication is kept so scoring and summarizing share one pass
+DEDUP_CACHE_SIZE = 32
+
+# Spec icons, and spec names grouped into the categories shown in the summary
+PRIORITY_SPECS = {
+    'Brand': '🏢',
+    'Model': '📱',
+    'Operating System': '⚙️',
+    'Display': '📱',
+    'Battery': '🔋',
+    'Chipset': '💻',
+    'RAM & Storage': '💾',
+    'Camera': '📸',
+    'Water/Dust Resistance': '💧',
+    'Special Features': '✨',
+    'Dimensions': '📏',
+    'Weight': '⚖️',
+    'Color': '🎨',
+    'Connectivity': '📡',
+    'Form Factor': '📱'
+}
+
+SPEC_CATEGORIES = {
+    'Core Specs': ['Brand', 'Model', 'Operating System'],
+    'Performance': ['Chipset', 'RAM & Storage'],
+    'Display & Camera': ['Display', 'Camera'],
+    'Battery & Power': ['Battery'],
+    'Design': ['Dimensions', 'Weight', 'Color', 'Form Factor', 'Water/Dust Resistance'],
+    'Connectivity': ['Connectivity', 'Special Features']
+}
+
+# Words in review sentences that refer to each spec in SPEC_CATEGORIES
+ASPECT_KEYWORDS = {
+    'Operating System': ['software', 'android', 'ios', 'ui', 'os', 'update', 'updates', 'bloatware'],
+    'Chipset': ['processor', 'chipset', 'chip', 'performance', 'lag', 'laggy', 'gaming', 'heating', 'snapdragon', 'dimensity'],
+    'RAM & Storage': ['ram', 'storage', 'memory', 'multitasking'],
+    'Display': ['display', 'screen', 'brightness', 'amoled', 'oled', 'refresh rate', 'resolution'],
+    'Camera': ['camera', 'cameras', 'photo', 'photos', 'picture', 'pictures', 'selfie', 'selfies', 'video', 'videos', 'zoom'],
+    'Battery': ['battery', 'battery life', 'backup', 'charging', 'charger', 'charge', 'mah'],
+    'Weight': ['weight', 'heavy', 'lightweight'],
+    'Water/Dust Resistance': ['water', 'waterproof', 'dust', 'splash'],
+    'Connectivity': ['network', 'signal', '5g', 'wifi', 'wi-fi', 'bluetooth', 'nfc'],
+    'Special Features': ['speaker', 'speakers', 'sound', 'fingerprint', 'face unlock'],
+}
+
+_sentiment_analyzer = SentimentIntensityAnalyzer()
+# Sentences are scored in one batch, on the model server when one is running
+_aspect_engine = AspectEngine(
+    ASPECT_KEYWORDS, lambda sentences: [scores['compound'] for scores in analyze_sentiment_batch(sentences)]
+)
+# Spec key substrings that identify each spec name, e.g. 'ram storage' for 'RAM & Storage'
+_SPEC_NAME_AUTOMATON = KeywordAutomaton(
+    {variant.lower(): spec
+     for specs in SPEC_CATEGORIES.values() for spec in specs
+     for variant in [spec.replace('/', ' '), spec.replace(' & ', ' '), spec]},
+    whole_words=False
+)
+_QUICK_SPEC_AUTOMATON = KeywordAutomaton(
+    {keyword: keyword for keyword in ['chipset', 'battery', 'display', 'camera']},
+    whole_words=False
+)
+
+_anchor_matrix: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+_spec_embedding_cache: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+_anchor_lock = threading.Lock()
+_spec_cache_lock = threading.Lock()
+_dedup_cache: 'OrderedDict[str, Tuple[List[int], Dict[str, int]]]' = OrderedDict()
+_dedup_cache_lock = threading.Lock()
+
+def _load_model():
+    """Initialize BERT model and tokenizer on first use."""
+    global tokenizer, model
+    with _model_lock:
+        if model is None:
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+            model = AutoModel.from_pretrained(MODEL_NAME)
+    return tokenizer, model
 
 def get_bert_embeddings(text: str) -> np.ndarray:
     """Get BERT embeddings for a given text."""
-    inputs = tokenizer(text, return_tensors='pt', truncation=True, max_length=512, padding=True)
+    return get_bert_embeddings_batch([text])[0]
+
+def get_bert_embeddings_batch(texts: List[str]) -> np.ndarray:
+    """Get mean-pooled BERT embeddings for several texts in one forward pass.
+
+    Uses the shared model server when one is running, otherwise the in-process model.
+    """
+    client = get_client()
+    if client is not None and client.available:
+        try:
+            return client.embed(texts)
+        except ModelServerUnavailable:
+            pass
+    
+    bert_tokenizer, bert_model = _load_model()
+    with _tokenizer_lock:
+        inputs = bert_tokenizer(texts, return_tensors='pt', truncation=True, max_length=128, padding=True)
     with torch.no_grad():
-        outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1).squeeze().numpy()
+        outputs = bert_model(**inputs)
+    # Average over real tokens only, ignoring padding
+    mask = inputs['attention_mask'].unsqueeze(-1).float()
+    summed = (outputs.last_hidden_state * mask).sum(dim=1)
+    return (summed / mask.sum(dim=1).clamp(min=1)).numpy()
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+def _anchor_cache_key() -> str:
+    payload = MODEL_NAME + json.dumps(FEATURE_ANCHORS, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def load_anchor_matrix(path: str = ANCHOR_CACHE_PATH) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load the normalized anchor embedding matrix, computing and persisting it if needed.
+
+    Returns the (anchors x dim) matrix, the category index of each anchor row and
+    a boolean array marking positive anchors.
+    """
+    global _anchor_matrix
+    if _anchor_matrix is not None:
+        return _anchor_matrix
+
+    with _anchor_lock:
+        if _anchor_matrix is not None:
+            return _anchor_matrix
+
+        key = _anchor_cache_key()
+        if os.path.exists(path):
+            try:
+                with np.load(path) as cached:
+                    if str(cached['key']) == key:
+                        _anchor_matrix = (cached['matrix'], cached['category_ids'], cached['positive'])
+                        return _anchor_matrix
+            except (OSError, KeyError, ValueError):
+                pass
+
+        phrases, category_ids, positive = [], [], []
+        for category_id, anchors in enumerate(FEATURE_ANCHORS.values()):
+            for polarity in ('positive', 'negative'):
+                for phrase in anchors[polarity]:
+                    phrases.append(phrase)
+                    category_ids.append(category_id)
+                    positive.append(polarity == 'positive')
+
+        matrix = _normalize_rows(get_bert_embeddings_batch(phrases)).astype(np.float32)
+        _anchor_matrix = (matrix, np.array(category_ids), np.array(positive))
+        try:
+            np.savez(path, key=np.array(key), matrix=matrix, category_ids=_anchor_matrix[1], positive=_anchor_matrix[2])
+        except OSError:
+            pass
+        return _anchor_matrix
+
+def get_spec_embeddings(texts: List[str]) -> np.ndarray:
+    """Normalized embeddings for a product's spec texts, cached per product."""
+    key = hashlib.sha1('\n'.join(texts).encode('utf-8')).hexdigest()
+    with _spec_cache_lock:
+        if key in _spec_embedding_cache:
+            _spec_embedding_cache.move_to_end(key)
+            return _spec_embedding_cache[key]
+
+    embeddings = _normalize_rows(get_bert_embeddings_batch(texts)).astype(np.float32)
+    with _spec_cache_lock:
+        _spec_embedding_cache[key] = embeddings
+        if len(_spec_embedding_cache) > SPEC_EMBEDDING_CACHE_SIZE:
+            _spec_embedding_cache.popitem(last=False)
+    return embeddings
+
+def deduplicate_reviews_cached(reviews: List[Dict]) -> Tuple[List[Dict], Dict[str, int]]:
+    """deduplicate_reviews, cached per product so the score and the summary collapse reviews once."""
+    key = hashlib.sha1(json.dumps(reviews, sort_keys=True).encode('utf-8')).hexdigest()
+    with _dedup_cache_lock:
+        if key in _dedup_cache:
+            _dedup_cache.move_to_end(key)
+            kept_indices, report = _dedup_cache[key]
+            return [reviews[i] for i in kept_indices], dict(report)
+
+    kept, report = deduplicate_reviews(reviews)
+    # kept is an ordered subsequence of reviews
+    kept_indices = []
+    for i, review in enumerate(reviews):
+        if len(kept_indices) < len(kept) and review is kept[len(kept_indices)]:
+            kept_indices.append(i)
+    with _dedup_cache_lock:
+        _dedup_cache[key] = (kept_indices, report)
+        if len(_dedup_cache) > DEDUP_CACHE_SIZE:
+            _dedup_cache.popitem(last=False)
+    return kept, dict(report)
 
 def analyze_sentiment(text: str) -> Dict[str, float]:
     """Analyze sentiment of text using VADER."""
-    sia = SentimentIntensityAnalyzer()
-    return sia.polarity_scores(text)
+    return _sentiment_analyzer.polarity_scores(text)
+
+def analyze_sentiment_batch(texts: List[str]) -> List[Dict[str, float]]:
+    """Analyze sentiment of several texts, on the shared model server when one is running."""
+    client = get_client()
+    if client is not None and client.available:
+        try:
+            return client.sentiment(texts)
+        except ModelServerUnavailable:
+            pass
+    return [analyze_sentiment(text) for text in texts]
+
+def analyze_aspects(reviews: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """Per-aspect sentiment over review sentences that mention each aspect."""
+    return _aspect_engine.analyze(review.get('content', '') for review in reviews)
 
-def calculate_review_score(review: Dict) -> float:
+def calculate_review_score(review: Dict, sentiment: Optional[Dict[str, float]] = None) -> float:
     """Calculate a score for a single review based on sentiment and rating."""
-    # Get sentiment scores
-    content = review.get('content', '')
-    sentiment = analyze_sentiment(content)
+    # Get sentiment scores unless they were computed in a batch
+    if sentiment is None:
+        sentiment = analyze_sentiment(review.get('content', ''))
     
     # Convert rating to float (assuming 5-star scale)
     try:
@@ -65,21 +316,76 @@ def calculate_rating_score(rating_distribution: Dict[str, float]) -> float:
     # Normalize to 0-100 scale
     return (weighted_sum / total_weight) * 20  # Convert 5-star scale to 100-point scale
 
+def _best_anchor_similarity(similarity: np.ndarray, category_ids: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Highest similarity to the anchors selected by mask, per row and category."""
+    best = np.full((similarity.shape[0], len(FEATURE_ANCHORS)), -1.0, dtype=np.float32)
+    for category_id in range(len(FEATURE_ANCHORS)):
+        columns = mask & (category_ids == category_id)
+        if columns.any():
+            best[:, category_id] = similarity[:, columns].max(axis=1)
+    return best
+
+def _relevance_gaps(relevance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Closest category per row and how far it stands above the row's mean over categories."""
+    best_category = relevance.argmax(axis=1)
+    gaps = relevance[np.arange(len(relevance)), best_category] - relevance.mean(axis=1)
+    return best_category, gaps
+
+def calibrate_relevance_cutoff(anchors: np.ndarray, category_ids: np.ndarray) -> float:
+    """Relevance gap a spec needs to count towards the score, calibrated on the anchors.
+
+    Each anchor is matched against the other anchors like a spec would be; the
+    cutoff is FEATURE_RELEVANCE_FRACTION of the median gap they reach.
+    """
+    similarity = anchors @ anchors.T
+    np.fill_diagonal(similarity, -1.0)
+    relevance = _best_anchor_similarity(similarity, category_ids, np.ones(len(anchors), dtype=bool))
+    _, gaps = _relevance_gaps(relevance)
+    return FEATURE_RELEVANCE_FRACTION * float(np.median(gaps))
+
+def match_spec_categories(spec_texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Closest category, relevance weight and positive-minus-negative margin for each spec text.
+
+    Specs that are not clearly closer to one category than to the others get weight 0.
+    """
+    anchors, category_ids, positive = load_anchor_matrix()
+    similarity = get_spec_embeddings(spec_texts) @ anchors.T  # (specs x anchors) cosine similarity
+
+    # Best positive and negative anchor match per spec and category
+    positive_sim = _best_anchor_similarity(similarity, category_ids, positive)
+    negative_sim = _best_anchor_similarity(similarity, category_ids, ~positive)
+
+    best_category, gaps = _relevance_gaps(np.maximum(positive_sim, negative_sim))
+    weights = np.clip(gaps - calibrate_relevance_cutoff(anchors, category_ids), 0, None)
+    rows = np.arange(len(spec_texts))
+    margins = positive_sim[rows, best_category] - negative_sim[rows, best_category]
+    return best_category, weights, margins
+
 def analyze_features(specifications: Dict[str, Union[str, List[str]]]) -> float:
     """Analyze product features using BERT embeddings."""
     if not specifications:
         return 50  # Neutral score if no features available
     
-    # Convert specifications to text
-    feature_text = ' '.join(str(v) for v in specifications.values())
-    
-    # Get sentiment of features
-    feature_sentiment = analyze_sentiment(feature_text)
-    
-    # Convert sentiment to score (0-100)
-    feature_score = ((feature_sentiment['compound'] + 1) / 2) * 100
-    
-    return feature_score
+    # One text per spec so each can be matched to its own category
+    spec_texts = []
+    for key, value in specifications.items():
+        if isinstance(value, list):
+            value = ', '.join(value)
+        if str(value).strip():
+            spec_texts.append(f"{key}: {value}")
+    if not spec_texts:
+        return 50
+    
+    # Weight each spec's margin by how clearly it belongs to its category
+    _, weights, margins = match_spec_categories(spec_texts)
+    if weights.sum() == 0:
+        return 50
+    
+    # Convert the weighted margin to a score (0-100)
+    weighted_margin = float((margins * weights).sum() / weights.sum())
+    feature_score = 50 + 50 * np.tanh(FEATURE_MARGIN_SCALE * weighted_margin)
+    
+    return float(feature_score)
 
 def calculate_metacritic_score(product_data: Dict) -> Dict[str, Union[float, Dict[str, float]]]:
     """Calculate overall metacritic score and component scores."""
@@ -87,10 +393,25 @@ def calculate_metacritic_score(product_data: Dict) -> Dict[str, Union[float, Dic
     review_scores = []
     rating_score = 0
     feature_score = 50  # Default neutral score
+    dedup_report = {'total': 0, 'kept': 0, 'collapsed': 0, 'groups': 0, 'dedup_time_ms': 0.0,
+                    'scoring_time_saved_ms': 0.0}
     
-    # Calculate review scores
+    # Calculate review scores, skipping near-duplicate reviews
     if product_data.get('reviews'):
-        review_scores = [calculate_review_score(review) for review in product_data['reviews']]
+        start = time.perf_counter()
+        reviews, report = deduplicate_reviews_cached(product_data['reviews'])
+        dedup_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        sentiments = analyze_sentiment_batch([review.get('content', '') for review in reviews])
+        review_scores = [calculate_review_score(review, sentiment) for review, sentiment in zip(reviews, sentiments)]
+        elapsed = time.perf_counter() - start
+        
+        # Estimate the time duplicates would have cost at the measured per-review rate,
+        # net of the time spent finding them (negative when dedup cost more than it saved)
+        dedup_report.update(report)
+        dedup_report['dedup_time_ms'] = round(dedup_elapsed * 1000, 2)
+        saved = elapsed / len(reviews) * report['collapsed'] - dedup_elapsed
+        dedup_report['scoring_time_saved_ms'] = round(saved * 1000, 2)
         
     # Calculate rating distribution score
     if product_data.get('rating_distribution'):
@@ -125,7 +446,8 @@ def calculate_metacritic_score(product_data: Dict) -> Dict[str, Union[float, Dic
             'review_score': round(avg_review_score, 2),
             'rating_score': round(rating_score, 2),
             'feature_score': round(feature_score, 2)
-        }
+        },
+        'deduplication': dedup_report
     }
     
     return score_details
@@ -186,7 +508,7 @@ def generate_product_summary(product_data: Dict) -> str:
             summary_text.append(f"*{title_parts[1]}*")
         
         # Extract and format key specs for overview
-        key_specs = [spec for spec in specs.values() if isinstance(spec, str) and any(keyword in spec.lower() for keyword in ['chipset', 'battery', 'display', 'camera'])]
+        key_specs = [spec for spec in specs.values() if isinstance(spec, str) and _QUICK_SPEC_AUTOMATON.labels_in(spec.lower())]
         if key_specs:
             summary_text.append("")
             summary_text.append("**Quick Specs:**")
@@ -211,48 +533,37 @@ def generate_product_summary(product_data: Dict) -> str:
                 else:
                     summary_text.extend([f"**{i}. {feature}**", ""])
 
-    
-    # Add important specifications with enhanced formatting
-    priority_specs = {
-        'Brand': '🏢',
-        'Model': '📱',
-        'Operating System': '⚙️',
-        'Display': '📱',
-        'Battery': '🔋',
-        'Chipset': '💻',
-        'RAM & Storage': '💾',
-        'Camera': '📸',
-        'Water/Dust Resistance': '💧',
-        'Special Features': '✨',
-        'Dimensions': '📏',
-        'Weight': '⚖️',
-        'Color': '🎨',
-        'Connectivity': '📡',
-        'Form Factor': '📱'
-    }
-    
-    # Organize specifications into categories
-    spec_categories = {
-        'Core Specs': ['Brand', 'Model', 'Operating System'],
-        'Performance': ['Chipset', 'RAM & Storage'],
-        'Display & Camera': ['Display', 'Camera'],
-        'Battery & Power': ['Battery'],
-        'Design': ['Dimensions', 'Weight', 'Color', 'Form Factor', 'Water/Dust Resistance'],
-        'Connectivity': ['Connectivity', 'Special Features']
-    }
+    # Add what reviewers say about each aspect
+    if product_data.get('reviews'):
+        # Reuses the deduplication done by calculate_metacritic_score for the same reviews
+        reviews, _ = deduplicate_reviews_cached(product_data['reviews'])
+        aspect_sentiment = analyze_aspects(reviews)
+        if aspect_sentiment:
+            summary_text.append("**🎯 What Reviewers Say**")
+            for aspect, stats in sorted(aspect_sentiment.items(), key=lambda item: -item[1]['sentences']):
+                mood = '👍' if stats['compound'] >= 0.05 else '👎' if stats['compound'] <= -0.05 else '😐'
+                emoji = PRIORITY_SPECS.get(aspect, '•')
+                summary_text.append(
+                    f"{emoji} **{aspect}**: {mood} {stats['compound']:+.2f} "
+                    f"({stats['positive']} positive, {stats['negative']} negative of {stats['sentences']} mentions)"
+                )
+            summary_text.append("")
     
     # Format specifications by category
-    if any(key in specs for key in [k for v in spec_categories.values() for k in v]):
+    if any(key in specs for key in [k for v in SPEC_CATEGORIES.values() for k in v]):
         summary_text.append("**📋 Technical Specifications**")
         
-        for category, category_specs in spec_categories.items():
+        # Spec names mentioned by each spec key, found in one automaton pass per key
+        key_spec_names = {spec_key: set(_SPEC_NAME_AUTOMATON.labels_in(spec_key.lower())) for spec_key in specs}
+        
+        for category, category_specs in SPEC_CATEGORIES.items():
             category_items = []
             for spec in category_specs:
                 for spec_key, value in specs.items():
-                    if any(k.lower() in spec_key.lower() for k in [spec, spec.replace(' & ', ' '), spec.replace('/', ' ')]):
+                    if spec in key_spec_names[spec_key]:
                         if isinstance(value, list):
                             value = ', '.join(value)
-                        emoji = priority_specs.get(spec, '•')
+                        emoji = PRIORITY_SPECS.get(spec, '•')
                         category_items.append(f"{emoji} **{spec}**: {value}")
                         break
             
@@ -2,9 +2,21 @@ import streamlit as st
 import json
 import pandas as pd
 import os
+import time
+import uuid
+from functools import partial
 import google.generativeai as genai
-from scrape import scrape_amazon
 from analyzer import calculate_metacritic_score, generate_product_summary
+from image_cache import ImageCache
+from jobs import JobManager
+from chat import generate_response
+from price_history import PriceHistoryStore
+from pipeline import MAX_COMPARE_PRODUCTS, analyze_product, compare_products
+from render import (
+    STYLES, build_analysis_html, build_comparison_card_html, build_metacritic_html, build_phrases_html, build_price_html,
+    build_rating_distribution_html, build_reviews_html, build_section_header, build_spec_grid_html,
+    build_title_html, paginate
+)
 
 st.set_page_config(
     page_title="InsightCart - Product Analysis",
@@ -22,6 +34,63 @@ if 'product_data' not in st.session_state:
 if 'api_key_configured' not in st.session_state:
     st.session_state.api_key_configured = False
 
+if 'review_page' not in st.session_state:
+    st.session_state.review_page = 0
+
+if 'comparison' not in st.session_state:
+    st.session_state.comparison = None
+
+if 'product_analysis' not in st.session_state:
+    st.session_state.product_analysis = None
+
+if 'active_job' not in st.session_state:
+    st.session_state.active_job = None
+
+if 'job_notice' not in st.session_state:
+    st.session_state.job_notice = None
+
+# Identifies this session to the shared job manager
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
+STAGE_LABELS = {
+    'fetching': 'Fetching product page',
+    'parsing': 'Parsing product details',
+    'scoring': 'Scoring reviews and features',
+    'summarizing': 'Summarizing',
+}
+
+# Inject all page styles once per run
+st.markdown(STYLES, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_image_cache():
+    # Shared by every session so images are downloaded once per server
+    return ImageCache()
+
+def analyze_with_images(url, image_cache, price_history, on_stage=None):
+    # Runs in a worker thread, so it must not call any st.* functions
+    result = analyze_product(url, on_stage=on_stage)
+    data = result['data']
+    # Record the price once per page fetch, not once per session that shows the result
+    if 'error' not in data and data.get('asin'):
+        price_history.record(data['asin'], data)
+    if data.get('image_urls'):
+        # Download the whole gallery concurrently while the result is still being picked up
+        image_cache.prefetch(data['image_urls'])
+    return result
+
+@st.cache_resource
+def get_price_history():
+    return PriceHistoryStore()
+
+@st.cache_resource
+def get_job_manager():
+    # Shared by every session so the same product is never analyzed twice at once
+    return JobManager(analyze=partial(
+        analyze_with_images, image_cache=get_image_cache(), price_history=get_price_history()
+    ))
+
 # Function to configure Gemini API
 def configure_gemini_api(api_key):
     if api_key:
@@ -30,64 +99,17 @@ def configure_gemini_api(api_key):
         return True
     return False
 
-# Function to generate response using Gemini API
-def generate_gemini_response(prompt):
-    try:
-        # Always read the latest product data from file
-        try:
-            with open('product_data.json', 'r', encoding='utf-8') as f:
-                product_data = json.load(f)
-        except Exception as e:
-            return f"Error loading product data: {str(e)}"
-            
-        # Create a context-rich prompt with product data
-        context = json.dumps(product_data, indent=2)
-        full_prompt = f"""You are a helpful shopping assistant that answers questions about a specific product.
-        Here is the product data in JSON format:
-        {context}
-        
-        Based only on the information provided above, please answer the following question:
-        {prompt}
-        
-        If the information is not available in the product data, please say so politely."""
-        
-        # Generate response using Gemini API with a compatible model
-        # Using gemini-pro instead of gemini-1.0-base which is not available
-        # for model in genai.list_models():
-        #     print(model.name)
-        model = genai.GenerativeModel('gemma-3-4b-it')
-        
-        response = model.generate_content(full_prompt)
-        return response.text
-    except Exception as e:
-        return f"Error generating response: {str(e)}"
-
 def display_metacritic_score(score_details):
     # Create a clean layout for the metacritic score
-    st.markdown("""
-    <style>
-    .metacritic-score {
-        font-size: 48px;
-        font-weight: bold;
-        text-align: center;
-        padding: 20px;
-        border-radius: 10px;
-        margin: 20px 0;
-    }
-    .high-score { color: #6c3; background-color: #f0f8f0; }
-    .mid-score { color: #fc3; background-color: #f8f7f0; }
-    .low-score { color: #f00; background-color: #f8f0f0; }
-    </style>
-    """, unsafe_allow_html=True)
-
-    final_score = score_details['final_score']
-    score_class = 'high-score' if final_score >= 75 else 'mid-score' if final_score >= 50 else 'low-score'
-    
-    st.markdown(f"""
-    <div class='metacritic-score {score_class}'>
-        {final_score}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(build_metacritic_html(score_details['final_score']), unsafe_allow_html=True)
+
+    dedup_report = score_details.get('deduplication')
+    if dedup_report and dedup_report['collapsed']:
+        st.caption(
+            f"Collapsed {dedup_report['collapsed']} near-duplicate reviews out of {dedup_report['total']}; "
+            f"net scoring time saved {dedup_report['scoring_time_saved_ms']:.0f} ms "
+            f"after {dedup_report['dedup_time_ms']:.0f} ms spent deduplicating"
+        )
 
     # Display component scores
     st.markdown("### Score Breakdown")
@@ -118,268 +140,211 @@ def display_metacritic_score(score_details):
         }
     )
 
-def display_product_data(data):
+@st.cache_data(show_spinner=False)
+def get_product_analysis(data):
+    # Cached so paging through reviews does not rerun the models
+    return calculate_metacritic_score(data), generate_product_summary(data)
+
+def change_review_page(delta):
+    st.session_state.review_page += delta
+
+def display_reviews(reviews):
+    page_reviews, page, num_pages = paginate(reviews, st.session_state.review_page)
+    st.session_state.review_page = page
+    st.markdown(build_reviews_html(page_reviews), unsafe_allow_html=True)
+
+    if num_pages > 1:
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            st.button('← Previous', on_click=change_review_page, args=(-1,),
+                      disabled=page == 0, key='review_prev')
+        with page_col:
+            st.caption(f"Page {page + 1} of {num_pages} · {len(reviews)} reviews")
+        with next_col:
+            st.button('Next →', on_click=change_review_page, args=(1,),
+                      disabled=page >= num_pages - 1, key='review_next')
+
+PRICE_HISTORY_WINDOWS = {'7 days': 7 * 86400, '30 days': 30 * 86400, 'All time': None}
+
+def display_price_history(asin):
+    window = st.radio('Window', list(PRICE_HISTORY_WINDOWS), horizontal=True, key='price_window',
+                      label_visibility='collapsed')
+    span = PRICE_HISTORY_WINDOWS[window]
+    start = int(time.time()) - span if span else None
+
+    store = get_price_history()
+    stats = store.stats(asin, start=start)
+    if not stats['count']:
+        st.caption('No price history in this window yet.')
+        return
+
+    history = store.history(asin, start=start, max_points=500)
+    chart_df = pd.DataFrame(
+        {'Price': history['price']},
+        index=pd.to_datetime(history['timestamp'], unit='s')
+    )
+    st.line_chart(chart_df)
+
+    low_col, median_col, high_col, count_col = st.columns(4)
+    low_col.metric('Lowest', f"₹{stats['min']:,}")
+    median_col.metric('Median', f"₹{stats['p50']:,.0f}")
+    high_col.metric('Highest', f"₹{stats['max']:,}")
+    count_col.metric('Samples', stats['count'])
+
+def display_product_data(data, analysis=None):
     if 'error' in data:
         st.error(f"Error: {data['error']}")
         return
 
-    # Add custom CSS for layout
-    st.markdown("""
-    <style>
-    /* Global Styles */
-    .stApp {
-        background-color: #121212;
-        color: #e0e0e0;
-    }
-    
-    /* Product Title and Badge */
-    .product-title {
-        font-size: 32px;
-        color: #90caf9;
-        margin-bottom: 24px;
-        font-weight: 600;
-        letter-spacing: -0.5px;
-        line-height: 1.2;
-        transition: color 0.3s ease;
-    }
-    .product-title:hover {
-        color: #64b5f6;
-    }
-    .launch-badge {
-        background: linear-gradient(45deg, #ff4081, #e91e63);
-        color: white;
-        padding: 6px 12px;
-        border-radius: 20px;
-        font-size: 14px;
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        box-shadow: 0 2px 4px rgba(233, 30, 99, 0.2);
-        display: inline-block;
-        margin-bottom: 16px;
-    }
-    
-    /* Price Tag */
-    .price-tag {
-        font-size: 42px;
-        background: linear-gradient(45deg, #2e7d32, #43a047);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-weight: 700;
-        margin: 20px 0;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Specifications */
-    .spec-container {
-        background: #1e1e1e;
-        border-radius: 12px;
-        padding: 20px;
-        box-shadow: 0 4px 6px rgba(255,255,255,0.1);
-        margin: 16px 0;
-        transition: transform 0.2s ease;
-    }
-    .spec-container:hover {
-        transform: translateY(-2px);
-    }
-    .spec-label {
-        color: #90a4ae;
-        font-size: 14px;
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        margin-bottom: 8px;
-    }
-    .spec-value {
-        font-weight: 600;
-        color: #e0e0e0;
-        font-size: 16px;
-        line-height: 1.5;
-    }
-    
-    /* Review Container */
-    .review-stats {
-        background-color: #1e1e1e;
-        padding: 24px;
-        border-radius: 16px;
-        box-shadow: 0 4px 12px rgba(255,255,255,0.08);
-        margin: 24px 0;
-    }
-    
-    /* Common Phrases */
-    .common-phrase {
-        background: #1e1e1e;
-        color: #90caf9;
-        padding: 8px 16px;
-        border-radius: 20px;
-        margin: 8px 0;
-        display: inline-block;
-        font-weight: 500;
-        transition: all 0.2s ease;
-    }
-    .common-phrase:hover {
-        background: #2c2c2c;
-        transform: scale(1.02);
-    }
-    
-    /* Rating Distribution */
-    .rating-bar {
-        background: linear-gradient(90deg, #ffd54f 0%, #ffb300 100%);
-        border-radius: 4px;
-        height: 8px;
-        transition: width 0.3s ease;
-    }
-    .rating-container {
-        background: #1e1e1e;
-        padding: 16px;
-        border-radius: 12px;
-        box-shadow: 0 2px 4px rgba(255,255,255,0.05);
-        margin: 8px 0;
-    }
-    
-    /* Section Headers */
-    .section-header {
-        font-size: 24px;
-        color: #90caf9;
-        margin: 32px 0 16px;
-        font-weight: 600;
-        border-bottom: 3px solid #2c2c2c;
-        padding-bottom: 8px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    score_details, summary = analysis or get_product_analysis(data)
 
     # Create top layout for title and image with improved spacing
     title_col, analysis_col, right_col = st.columns([1.2, 1, 1])
 
     with title_col:
-        # NEW LAUNCH badge with animation
-        st.markdown("<span class='launch-badge'>NEW LAUNCH</span>", unsafe_allow_html=True)
-        
-        # Product Title with hover effect
-        full_title = data['title']
-        short_title = full_title.split('|')[0].strip()
-        st.markdown(f"<h1 class='product-title'>{short_title}</h1>", unsafe_allow_html=True)
+        st.markdown(build_title_html(data['title']), unsafe_allow_html=True)
         
-        # Main product image with shadow and hover effect
+        # Main product image
         if data['image_urls']:
-            st.markdown("""
-                <style>
-                .product-image {
-                    border-radius: 12px;
-                    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                    transition: transform 0.3s ease;
-                }
-                .product-image:hover {
-                    transform: scale(1.02);
-                }
-                </style>
-            """, unsafe_allow_html=True)
-            st.image(data['image_urls'][0], use_container_width=True, output_format='auto')
+            main_image = get_image_cache().get(data['image_urls'][0]) or data['image_urls'][0]
+            st.image(main_image, use_container_width=True, output_format='auto')
 
     with analysis_col:
-        # Product Analysis section with modern styling
-        st.markdown("<h2 class='section-header'>🔍 Product Analysis</h2>", unsafe_allow_html=True)
-        summary = generate_product_summary(data)
-        analysis_points = summary.split('\n')
-        
-        # Create a container for analysis points
-        st.markdown("<div class='spec-container'>", unsafe_allow_html=True)
-        for point in analysis_points:
-            if point.strip():
-                st.markdown(f"<div class='spec-value'>{point.strip()}</div>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown(build_analysis_html(summary), unsafe_allow_html=True)
 
     with right_col:
-        # Price display with gradient effect
+        # Price and review analysis header in a single fragment
+        header_html = build_section_header('📊 Review Analysis')
         if data['price']:
-            st.markdown(f"<div class='price-tag'>₹{data['price']}</div>", unsafe_allow_html=True)
-
-        # Review Analysis with modern card design
-        st.markdown("<h2 class='section-header'>📊 Review Analysis</h2>", unsafe_allow_html=True)
-        score_details = calculate_metacritic_score(data)
+            header_html = build_price_html(data['price']) + header_html
+        st.markdown(header_html, unsafe_allow_html=True)
         display_metacritic_score(score_details)
 
-        # Common Phrases with interactive badges
-        st.markdown("<h2 class='section-header'>💬 Common Phrases</h2>", unsafe_allow_html=True)
         common_phrases = ["Great Value", "Excellent Display", "Average Battery"]
-        for phrase in common_phrases:
-            st.markdown(f"<span class='common-phrase'>{phrase}</span>", unsafe_allow_html=True)
-
-        # Rating Distribution with modern styling
-        if data.get('rating_distribution'):
-            st.markdown("<h2 class='section-header'>⭐ Rating Distribution</h2>", unsafe_allow_html=True)
-            total_ratings = sum(data['rating_distribution'].values())
-            if total_ratings > 0:
-                for stars in ['5', '4', '3', '2', '1']:
-                    percentage = data['rating_distribution'][stars]
-                    st.markdown(f"""
-                        <div class='rating-container'>
-                            <div style='display: flex; align-items: center; justify-content: space-between;'>
-                                <span style='color: #ffa000; font-weight: 500;'>{stars}★</span>
-                                <div style='flex-grow: 1; margin: 0 10px;'>
-                                    <div class='rating-bar' style='width: {percentage}%;'></div>
-                                </div>
-                                <span style='color: #455a64; font-weight: 500;'>{percentage}%</span>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
+        st.markdown(
+            build_phrases_html(common_phrases) + build_rating_distribution_html(data.get('rating_distribution')),
+            unsafe_allow_html=True
+        )
 
     # Display specifications in modern card layout
-    st.markdown("<h2 class='section-header'>📋 Specifications</h2>", unsafe_allow_html=True)
+    st.markdown(build_section_header('📋 Specifications'), unsafe_allow_html=True)
     if data['specifications']:
-        spec_cols = st.columns(3)
-        for idx, (key, value) in enumerate(data['specifications'].items()):
-            with spec_cols[idx % 3]:
-                st.markdown(f"""
-                    <div class='spec-container'>
-                        <div class='spec-label'>{key}</div>
-                        <div class='spec-value'>{value}</div>
-                    </div>
-                """, unsafe_allow_html=True)
+        st.markdown(build_spec_grid_html(data['specifications']), unsafe_allow_html=True)
     
-    # Display all Reviews with modern styling
+    if data.get('asin'):
+        st.markdown(build_section_header('📈 Price History'), unsafe_allow_html=True)
+        display_price_history(data['asin'])
+    
+    # Display one page of reviews at a time
     if data['reviews']:
-        st.markdown("<h2 class='section-header'>📝 Customer Reviews</h2>", unsafe_allow_html=True)
-        for review in data['reviews']:
-            # Calculate rating display
-            rating = float(review.get('rating', '0'))
-            rating_int = int(rating)
-            stars_filled = '★' * rating_int
-            stars_empty = '★' * (5 - rating_int)
-            
-            # Create review container
-            with st.container():
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    # Review title
-                    st.markdown(f"### {review.get('title', 'Customer Review')}")
-                    
-                    # Rating and date
-                    st.markdown(f"""
-                        <div style='display: flex; align-items: center; gap: 12px; margin-bottom: 10px;'>
-                            <span style='color: #ffd700; font-size: 20px; letter-spacing: 2px'>{stars_filled}<span style='color: rgba(255, 215, 0, 0.3)'>{stars_empty}</span></span>
-                            <span style='color: #ffd700'>{rating}/5</span>
-                            <span style='color: #90caf9; opacity: 0.8'>{review.get('review_date', '')}</span>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Review content
-                    st.markdown(f"""
-                        <div style='background: rgba(255, 255, 255, 0.03); padding: 15px; border-radius: 10px; margin: 10px 0;'>
-                            {review.get('content', '')}
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Reviewer name
-                    st.markdown(f"""
-                        <div style='color: #90caf9; margin-top: 10px;'>
-                            Reviewed by <span style='color: #64b5f6; font-weight: 500'>{review.get('reviewer_name', 'Anonymous')}</span>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("<hr style='border-color: rgba(255,255,255,0.1); margin: 20px 0;'>", unsafe_allow_html=True)
+        st.markdown(build_section_header('📝 Customer Reviews'), unsafe_allow_html=True)
+        display_reviews(data['reviews'])
+
+
+def display_comparison_column(result, image_cache):
+    data = result['data']
+    if data.get('image_urls'):
+        thumbnail = image_cache.get(data['image_urls'][0], variant='thumb') or data['image_urls'][0]
+        st.image(thumbnail, use_container_width=True)
+    st.markdown(build_comparison_card_html(result), unsafe_allow_html=True)
+
+def display_comparison_table(results):
+    rows = []
+    for result in results:
+        if result['score_details'] is None:
+            continue
+        component_scores = result['score_details']['component_scores']
+        rows.append({
+            'Product': (result['data'].get('title') or result['url']).split('|')[0].strip(),
+            'Price': result['data'].get('price', ''),
+            'Score': result['score_details']['final_score'],
+            'Reviews': component_scores['review_score'],
+            'Ratings': component_scores['rating_score'],
+            'Features': component_scores['feature_score'],
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+def display_comparison_interface():
+    st.markdown("### Compare Products")
+    urls_text = st.text_area(f'Enter 2 to {MAX_COMPARE_PRODUCTS} Amazon product URLs, one per line')
+    image_cache = get_image_cache()
+
+    if st.button('Compare Products'):
+        urls = [line.strip() for line in urls_text.splitlines() if line.strip()]
+        if not 2 <= len(urls) <= MAX_COMPARE_PRODUCTS:
+            st.warning(f'Please enter between 2 and {MAX_COMPARE_PRODUCTS} product URLs')
+            return
+        if not all('amazon' in url.lower() for url in urls):
+            st.error('Please enter only valid Amazon URLs')
+            return
+
+        # Fill each column as soon as its product finishes
+        placeholders = [column.empty() for column in st.columns(len(urls))]
+        for placeholder in placeholders:
+            placeholder.info('Analyzing...')
+
+        results = [None] * len(urls)
+        analyze = partial(analyze_with_images, image_cache=image_cache, price_history=get_price_history())
+        for index, result in compare_products(urls, analyze=analyze):
+            results[index] = result
+            with placeholders[index].container():
+                display_comparison_column(result, image_cache)
+
+        st.session_state.comparison = results
+        display_comparison_table(results)
+    elif st.session_state.comparison:
+        results = st.session_state.comparison
+        for column, result in zip(st.columns(len(results)), results):
+            with column:
+                display_comparison_column(result, image_cache)
+        display_comparison_table(results)
+
+def finish_analysis(result):
+    data = result['data']
+
+    # Save to file
+    with open('product_data.json', 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    st.session_state.job_notice = ('success', 'Data saved to product_data.json')
+
+    # Store product data in session state for chatbot and later reruns
+    st.session_state.product_data = data
+    st.session_state.product_analysis = None if 'error' in data else (result['score_details'], result['summary'])
+    st.session_state.review_page = 0
+
+def cancel_active_job():
+    # Only this session stops waiting; the job keeps running while other sessions wait for it
+    get_job_manager().cancel(st.session_state.active_job, st.session_state.session_id)
+    st.session_state.active_job = None
+    st.session_state.job_notice = ('info', 'Analysis cancelled')
+
+@st.fragment(run_every=0.5)
+def display_job_progress():
+    key = st.session_state.active_job
+    if key is None:
+        # This session cancelled; redraw the page to drop the progress bar and show the notice
+        st.rerun()
+    job = get_job_manager().get(key)
+    if job is None:
+        st.session_state.active_job = None
+        return
+
+    if job.is_active:
+        label = STAGE_LABELS.get(job.stage, 'Waiting to start')
+        st.progress(job.progress, text=f"{label}...")
+        st.button('Cancel', on_click=cancel_active_job, key='cancel_job')
+        return
+
+    st.session_state.active_job = None
+    if job.status == 'done':
+        finish_analysis(job.result)
+    elif job.status == 'cancelled':
+        st.session_state.job_notice = ('info', 'Analysis cancelled')
+    else:
+        st.session_state.job_notice = ('error', f"Analysis failed: {job.error}")
+    # Redraw the whole page with the new product
+    st.rerun()
 
 def display_chatbot_interface():
     st.markdown("### Product Chatbot")
@@ -410,7 +375,7 @@ def display_chatbot_interface():
             # Generate and display assistant response
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
-                    response = generate_gemini_response(user_question)
+                    response = generate_response(user_question)
                     st.markdown(response)
             
             # Add assistant response to chat history
@@ -426,7 +391,7 @@ def display_chatbot_interface():
 # Streamlit UI
 st.title('InsightCart - Product Analysis')
 
-info_tab, model_tab = st.tabs(["Product Info", "ChatBot"])
+info_tab, compare_tab, model_tab = st.tabs(["Product Info", "Compare", "ChatBot"])
 
 with info_tab:
     url = st.text_input('Enter Amazon Product URL')
@@ -434,24 +399,23 @@ with info_tab:
     if st.button('Analyze Product'):
         if url:
             if 'amazon' in url.lower():
-                # Scrape product data
-                data = scrape_amazon(url)
-                
-                # Save to file
-                with open('product_data.json', 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
-                st.success('Data saved to product_data.json')
-                
-                # Store product data in session state for chatbot
-                st.session_state.product_data = data
-                
-                # Display the data in a formatted way
-                display_product_data(data)
+                # Analyze in the background; clicking again for the same product reuses the running job
+                job = get_job_manager().submit(url, st.session_state.session_id)
+                st.session_state.active_job = job.key
+                st.session_state.job_notice = None
             else:
                 st.error('Please enter a valid Amazon URL')
         else:
             st.warning('Please enter a product URL')
 
+    # The fragment polls twice a second, so only run it while this session waits for a job
+    if st.session_state.active_job:
+        display_job_progress()
+
+    if st.session_state.job_notice:
+        level, message = st.session_state.job_notice
+        getattr(st, level)(message)
+
     # Load existing product data if available
     if not st.session_state.product_data and os.path.exists('product_data.json'):
         try:
@@ -460,6 +424,13 @@ with info_tab:
         except Exception as e:
             st.error(f"Error loading product data: {str(e)}")
 
+    # Display the data in a formatted way; reruns such as review paging redraw from session state
+    if st.session_state.product_data:
+        display_product_data(st.session_state.product_data, st.session_state.product_analysis)
+
+with compare_tab:
+    display_comparison_interface()
+
 with model_tab:
     # Display chatbot interface
     display_chatbot_interface()
@@ -0,0 +1,152 @@
+import re
+from bisect import bisect_right
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+# Sentence spans: runs of text up to and including terminal punctuation or a newline
+_SENTENCE_RE = re.compile(r'[^.!?\n]+[.!?\n]*')
+
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every keyword occurrence in one pass over a text.
+
+    Keywords are matched case-sensitively, so callers should lowercase both the
+    keywords and the text. With whole_words, matches inside longer words are skipped.
+    """
+
+    def __init__(self, keywords: Dict[str, str], whole_words: bool = True):
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (keyword length, label) pairs ending at each state, including via fail links
+        self._outputs: List[List[Tuple[int, str]]] = [[]]
+
+        for keyword, label in keywords.items():
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._outputs[state].append((len(keyword), label))
+
+        # Breadth-first so every fail target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, label) for every keyword occurrence, ordered by end position."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            end = index + 1
+            for length, label in outputs[state]:
+                start = end - length
+                if self.whole_words and (
+                    (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum())
+                ):
+                    continue
+                yield start, end, label
+
+    def labels_in(self, text: str) -> List[str]:
+        """Distinct labels found in a text, in order of first appearance."""
+        return list(dict.fromkeys(label for _, _, label in self.iter_matches(text)))
+
+
+class AspectEngine:
+    """Scores review sentiment per aspect, scoring only sentences that mention an aspect."""
+
+    def __init__(self, aspect_keywords: Dict[str, Iterable[str]],
+                 score_sentences: Callable[[List[str]], List[float]]):
+        keywords = {}
+        for aspect, aspect_words in aspect_keywords.items():
+            for keyword in aspect_words:
+                keywords[keyword.lower()] = aspect
+        self.aspects = list(aspect_keywords)
+        self.automaton = KeywordAutomaton(keywords)
+        self.score_sentences = score_sentences
+
+    def analyze(self, texts: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Per-aspect mention counts and sentiment aggregates over all texts.
+
+        Each sentence is scored at most once, however many aspects it mentions,
+        and all sentences are scored in a single score_sentences call. Aspects
+        that are never mentioned are left out.
+        """
+        totals = {aspect: {'mentions': 0, 'sentences': 0, 'compound_sum': 0.0, 'positive': 0, 'negative': 0}
+                  for aspect in self.aspects}
+        # Sentences to score and the aspects each one mentions
+        sentence_texts: List[str] = []
+        sentence_aspects: List[List[str]] = []
+
+        for text in texts:
+            lowered = text.lower()
+            # Lowercasing can change the length of some characters; score the original when it did not
+            source = text if len(lowered) == len(text) else lowered
+            sentences = [match.span() for match in _SENTENCE_RE.finditer(lowered)]
+            if not sentences:
+                continue
+            sentence_starts = [start for start, _ in sentences]
+
+            # Sentence index -> aspects it mentions
+            mentioned: Dict[int, List[str]] = {}
+            # End of the last counted span per aspect; overlapping keywords such as
+            # "battery" and "battery life" extend that span instead of adding a mention
+            span_ends: Dict[str, int] = {}
+            for start, end, aspect in self.automaton.iter_matches(lowered):
+                if start < span_ends.get(aspect, 0):
+                    span_ends[aspect] = max(end, span_ends[aspect])
+                    continue
+                span_ends[aspect] = end
+                totals[aspect]['mentions'] += 1
+                sentence = bisect_right(sentence_starts, start) - 1
+                aspects = mentioned.setdefault(sentence, [])
+                if aspect not in aspects:
+                    aspects.append(aspect)
+
+            for sentence, aspects in mentioned.items():
+                start, end = sentences[sentence]
+                sentence_texts.append(source[start:end])
+                sentence_aspects.append(aspects)
+
+        compounds = self.score_sentences(sentence_texts) if sentence_texts else []
+        for compound, aspects in zip(compounds, sentence_aspects):
+            for aspect in aspects:
+                aspect_totals = totals[aspect]
+                aspect_totals['sentences'] += 1
+                aspect_totals['compound_sum'] += compound
+                if compound >= POSITIVE_THRESHOLD:
+                    aspect_totals['positive'] += 1
+                elif compound <= NEGATIVE_THRESHOLD:
+                    aspect_totals['negative'] += 1
+
+        results = {}
+        for aspect, aspect_totals in totals.items():
+            if not aspect_totals['sentences']:
+                continue
+            results[aspect] = {
+                'mentions': aspect_totals['mentions'],
+                'sentences': aspect_totals['sentences'],
+                'compound': aspect_totals['compound_sum'] / aspect_totals['sentences'],
+                'positive': aspect_totals['positive'],
+                'negative': aspect_totals['negative'],
+            }
+        return results
@@ -0,0 +1,166 @@
+"""Compare the product page renderer in render.py with the per-element renderer it replaced.
+
+Both run through Streamlit's AppTest, so element counts come from the rendered tree
+and times are whole script reruns:
+
+    python benchmark_render.py
+"""
+import os
+import statistics
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+from sample_data import sample_product
+
+
+def _legacy_product_page():
+    """The per-element product renderer that render.py replaced, as an AppTest script.
+
+    Reads the product, score details and summary from session state. The markup
+    is shortened and inline <style> blocks are replaced by STYLES, but it makes the
+    same st.* calls as the original, so element counts and rerun times compare.
+    """
+    import pandas as pd
+    import streamlit as st
+    from render import STYLES
+
+    data = st.session_state.product
+    score_details, summary = st.session_state.analysis
+
+    st.markdown(STYLES, unsafe_allow_html=True)
+    title_col, analysis_col, right_col = st.columns([1.2, 1, 1])
+
+    with title_col:
+        st.markdown("<span class='launch-badge'>NEW LAUNCH</span>", unsafe_allow_html=True)
+        short_title = data['title'].split('|')[0].strip()
+        st.markdown(f"<h1 class='product-title'>{short_title}</h1>", unsafe_allow_html=True)
+        if data['image_urls']:
+            st.markdown(STYLES, unsafe_allow_html=True)
+            st.image(data['image_urls'][0], use_container_width=True, output_format='auto')
+
+    with analysis_col:
+        st.markdown("<h2 class='section-header'>🔍 Product Analysis</h2>", unsafe_allow_html=True)
+        st.markdown("<div class='spec-container'>", unsafe_allow_html=True)
+        for point in summary.split('\n'):
+            if point.strip():
+                st.markdown(f"<div class='spec-value'>{point.strip()}</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with right_col:
+        if data['price']:
+            st.markdown(f"<div class='price-tag'>₹{data['price']}</div>", unsafe_allow_html=True)
+        st.markdown("<h2 class='section-header'>📊 Review Analysis</h2>", unsafe_allow_html=True)
+        st.markdown(STYLES, unsafe_allow_html=True)
+        st.markdown(f"<div class='metacritic-score'>{score_details['final_score']}</div>", unsafe_allow_html=True)
+        st.markdown("### Score Breakdown")
+        component_scores = score_details['component_scores']
+        st.dataframe(pd.DataFrame({
+            'Component': ['Review Analysis', 'Rating Distribution', 'Feature Analysis'],
+            'Score': [component_scores['review_score'], component_scores['rating_score'],
+                      component_scores['feature_score']],
+        }), hide_index=True)
+
+        st.markdown("<h2 class='section-header'>💬 Common Phrases</h2>", unsafe_allow_html=True)
+        for phrase in ["Great Value", "Excellent Display", "Average Battery"]:
+            st.markdown(f"<span class='common-phrase'>{phrase}</span>", unsafe_allow_html=True)
+
+        if data.get('rating_distribution'):
+            st.markdown("<h2 class='section-header'>⭐ Rating Distribution</h2>", unsafe_allow_html=True)
+            for stars in ['5', '4', '3', '2', '1']:
+                percentage = data['rating_distribution'][stars]
+                st.markdown(f"<div class='rating-container'>{stars}★ <div class='rating-bar' "
+                            f"style='width: {percentage}%;'></div> {percentage}%</div>", unsafe_allow_html=True)
+
+    st.markdown("<h2 class='section-header'>📋 Specifications</h2>", unsafe_allow_html=True)
+    if data['specifications']:
+        spec_cols = st.columns(3)
+        for idx, (key, value) in enumerate(data['specifications'].items()):
+            with spec_cols[idx % 3]:
+                st.markdown(f"<div class='spec-container'><div class='spec-label'>{key}</div>"
+                            f"<div class='spec-value'>{value}</div></div>", unsafe_allow_html=True)
+
+    if data['reviews']:
+        st.markdown("<h2 class='section-header'>📝 Customer Reviews</h2>", unsafe_allow_html=True)
+        for review in data['reviews']:
+            rating = float(review.get('rating', '0'))
+            with st.container():
+                col1, _ = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"### {review.get('title', 'Customer Review')}")
+                    st.markdown(f"<div>{'★' * int(rating)} {rating}/5 {review.get('review_date', '')}</div>",
+                                unsafe_allow_html=True)
+                    st.markdown(f"<div>{review.get('content', '')}</div>", unsafe_allow_html=True)
+                    st.markdown(f"<div>Reviewed by {review.get('reviewer_name', 'Anonymous')}</div>",
+                                unsafe_allow_html=True)
+                st.markdown("<hr>", unsafe_allow_html=True)
+
+
+def _count_elements(node) -> int:
+    """Number of rendered elements (not layout blocks) under an AppTest tree node."""
+    if isinstance(node, Block):
+        return sum(_count_elements(child) for child in node.children.values())
+    return 1
+
+
+def _time_reruns(app_test, runs: int) -> float:
+    """Median wall time of a script rerun in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        app_test.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    if app_test.exception:
+        raise RuntimeError(app_test.exception[0].value)
+    return statistics.median(timings)
+
+
+def main(runs: int = 10):
+    product = sample_product()
+    product['asin'] = 'B0BENCHMRK'
+    score_details = {
+        'final_score': 78,
+        'component_scores': {'review_score': 71.5, 'rating_score': 82.0, 'feature_score': 64.3},
+        'deduplication': {'total': 500, 'kept': 5, 'collapsed': 495, 'groups': 5,
+                          'dedup_time_ms': 12.0, 'scoring_time_saved_ms': 850.0},
+    }
+    analysis = (score_details, '\n'.join(f"- Summary point {i}" for i in range(40)))
+
+    legacy = AppTest.from_function(_legacy_product_page, default_timeout=120)
+    legacy.session_state['product'] = product
+    legacy.session_state['analysis'] = analysis
+    legacy_ms = _time_reruns(legacy, runs)
+    legacy_elements = _count_elements(legacy._tree)
+
+    # Run the real app in a scratch directory so its caches and product_data.json stay out of the repo.
+    # The analysis is preset, so reruns measure rendering rather than the models.
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='insightcart-bench-') as scratch:
+        os.chdir(scratch)
+        try:
+            app = AppTest.from_file(app_path, default_timeout=300)
+            app.run()
+            empty_ms = _time_reruns(app, runs)
+            empty_elements = _count_elements(app._tree)
+            app.session_state['product_data'] = product
+            app.session_state['product_analysis'] = analysis
+            full_ms = _time_reruns(app, runs)
+            full_elements = _count_elements(app._tree)
+        finally:
+            os.chdir(original_cwd)
+
+    # The product page is everything the app draws beyond its empty shell (tabs, inputs, chatbot)
+    batched_elements = full_elements - empty_elements
+    batched_ms = full_ms - empty_ms
+
+    print(f"Reviews: {len(product['reviews'])}, specs: {len(product['specifications'])}, median of {runs} reruns")
+    print(f"Legacy renderer:  {legacy_elements} elements, {legacy_ms:.1f} ms per rerun")
+    print(f"Batched renderer: {batched_elements} elements, {batched_ms:.1f} ms per rerun "
+          f"(whole app {full_ms:.1f} ms, empty app {empty_ms:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import json
+import time
+from typing import Callable, Dict, Optional
+
+import google.generativeai as genai
+
+PRODUCT_DATA_PATH = 'product_data.json'
+CHAT_MODEL_NAME = 'gemma-3-4b-it'
+
+PROMPT_TEMPLATE = """You are a helpful shopping assistant that answers questions about a specific product.
+        Here is the product data in JSON format:
+        {context}
+
+        Based only on the information provided above, please answer the following question:
+        {question}
+
+        If the information is not available in the product data, please say so politely."""
+
+
+def load_product_data(path: str = PRODUCT_DATA_PATH) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_prompt(context: str, question: str) -> str:
+    """Create a context-rich prompt with product data."""
+    return PROMPT_TEMPLATE.format(context=context, question=question)
+
+
+def create_model():
+    return genai.GenerativeModel(CHAT_MODEL_NAME)
+
+
+def generate_response(question: str, path: str = PRODUCT_DATA_PATH,
+                      model_factory: Callable = create_model,
+                      timings: Optional[Dict[str, float]] = None) -> str:
+    """Answer a question about the saved product using the chat model.
+
+    If a timings dict is given, the seconds spent in each stage (file_io,
+    serialize, prompt_build, client_build, model_call) are recorded in it.
+    """
+    if timings is None:
+        timings = {}
+    try:
+        # Always read the latest product data from file
+        start = time.perf_counter()
+        try:
+            product_data = load_product_data(path)
+        except Exception as e:
+            return f"Error loading product data: {str(e)}"
+        finally:
+            timings['file_io'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        context = json.dumps(product_data, indent=2)
+        timings['serialize'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full_prompt = build_prompt(context, question)
+        timings['prompt_build'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model = model_factory()
+        timings['client_build'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = model.generate_content(full_prompt)
+        timings['model_call'] = time.perf_counter() - start
+        return response.text
+    except Exception as e:
+        return f"Error generating response: {str(e)}"
@@ -0,0 +1,102 @@
+import re
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Word n-grams used as shingles
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: a pair becomes a candidate with probability 1 - (1 - J^4)^16, which is
+# about 99.98% at the 0.8 duplicate threshold but only about 64% at Jaccard 0.5
+LSH_BANDS = 16
+# Estimated Jaccard similarity at which two reviews count as duplicates
+DUPLICATE_THRESHOLD = 0.8
+# Reviews with fewer distinct shingles are never collapsed: short generic reviews such as
+# "Good product" are written independently by many people and are not copies
+MIN_SHINGLES = 4
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_RE = re.compile(r'\w+')
+
+# Fixed seed so signatures are comparable across runs
+_random = np.random.RandomState(1)
+_PERM_A = _random.randint(1, (1 << 32) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _random.randint(0, (1 << 32) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingle(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hash the word n-grams of a text to 32-bit integers."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    if len(tokens) < size:
+        grams = [' '.join(tokens)]
+    else:
+        grams = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in set(grams)), dtype=np.uint64)
+
+
+def minhash_signature(shingles: np.ndarray) -> np.ndarray:
+    """MinHash signature of a shingle set, one minimum per permutation."""
+    # Wrapping uint64 arithmetic is fine here; only the ordering of hash values matters
+    with np.errstate(over='ignore'):
+        hashes = (np.outer(_PERM_A, shingles) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return hashes.min(axis=1)
+
+
+def _review_text(review: Dict) -> str:
+    return review.get('content') or review.get('title') or ''
+
+
+def _rating(review: Dict) -> str:
+    return str(review.get('rating') or '').strip()
+
+
+def _find(parents: List[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def deduplicate_reviews(reviews: List[Dict], threshold: float = DUPLICATE_THRESHOLD) -> Tuple[List[Dict], Dict[str, int]]:
+    """Collapse near-duplicate reviews, keeping the first review of each group.
+
+    Candidate pairs come from LSH buckets over MinHash signatures and are kept
+    only if their estimated Jaccard similarity reaches the threshold. Only reviews
+    with the same rating are collapsed, and reviews shorter than MIN_SHINGLES
+    shingles are always kept.
+    """
+    report = {'total': len(reviews), 'kept': len(reviews), 'collapsed': 0, 'groups': 0}
+    indexed = [(i, shingle(_review_text(review))) for i, review in enumerate(reviews)]
+    indexed = [(i, shingles) for i, shingles in indexed if shingles.size >= MIN_SHINGLES]
+    if len(indexed) < 2:
+        return list(reviews), report
+
+    positions = [i for i, _ in indexed]
+    signatures = np.vstack([minhash_signature(shingles) for _, shingles in indexed])
+    rows_per_band = NUM_PERMUTATIONS // LSH_BANDS
+
+    parents = list(range(len(reviews)))
+    for band in range(LSH_BANDS):
+        band_slice = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        # First row seen in each bucket; later rows are compared against it only,
+        # so heavily duplicated buckets stay linear instead of quadratic. Buckets are
+        # split by rating so reviews that disagree on the score are never merged.
+        buckets: Dict[Tuple[str, bytes], int] = {}
+        for row, band_hash in enumerate(band_slice):
+            bucket_key = (_rating(reviews[positions[row]]), band_hash.tobytes())
+            other = buckets.setdefault(bucket_key, row)
+            if other == row:
+                continue
+            root_a, root_b = _find(parents, positions[other]), _find(parents, positions[row])
+            if root_a != root_b and np.mean(signatures[other] == signatures[row]) >= threshold:
+                # The earlier review stays the representative of the group
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+
+    kept = [review for i, review in enumerate(reviews) if _find(parents, i) == i]
+    group_roots = {_find(parents, i) for i in range(len(reviews)) if _find(parents, i) != i}
+    report.update({'kept': len(kept), 'collapsed': len(reviews) - len(kept), 'groups': len(group_roots)})
+    return kept, report
@@ -0,0 +1,177 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import requests
+from PIL import Image
+
+from scrape import HEADERS
+
+# Longest edge (in pixels) for each stored variant
+IMAGE_VARIANTS = {
+    'thumb': 160,
+    'display': 640,
+}
+
+DEFAULT_CACHE_DIR = '.image_cache'
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Seconds before a URL that failed to download is tried again
+FAILED_RETRY_INTERVAL = 300
+
+
+class ImageCache:
+    """On-disk cache of downscaled product images with LRU eviction."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 variants: Optional[Dict[str, int]] = None, max_workers: int = 8, timeout: float = 10,
+                 failed_retry_interval: float = FAILED_RETRY_INTERVAL):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.variants = variants or IMAGE_VARIANTS
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.failed_retry_interval = failed_retry_interval
+        self._lock = threading.Lock()
+        # URL -> monotonic time after which a failed download may be retried
+        self._failed: Dict[str, float] = {}
+        # File name -> size in bytes, least recently used first
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU index from files already on disk, oldest access first."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.jpg') and os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+
+    def _filename(self, url: str, variant: str) -> str:
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return f"{digest}_{variant}.jpg"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _fetch(self, url: str) -> bytes:
+        response = requests.get(url, headers=HEADERS, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def _downscale(self, raw: bytes, max_edge: int) -> bytes:
+        image = Image.open(io.BytesIO(raw))
+        image = image.convert('RGB')
+        image.thumbnail((max_edge, max_edge))
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=85, optimize=True)
+        return buffer.getvalue()
+
+    def _store(self, name: str, payload: bytes):
+        path = self._path(name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes -= self._index.pop(name, 0)
+            self._index[name] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used files until the cache fits in max_bytes. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes and self._index:
+            name, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def _touch(self, name: str) -> bool:
+        """Mark a cached file as recently used. Returns False if it is not cached."""
+        with self._lock:
+            if name not in self._index:
+                return False
+            self._index.move_to_end(name)
+        try:
+            os.utime(self._path(name))
+        except OSError:
+            return False
+        return True
+
+    def is_cached(self, url: str) -> bool:
+        with self._lock:
+            return all(self._filename(url, variant) in self._index for variant in self.variants)
+
+    def _recently_failed(self, url: str) -> bool:
+        with self._lock:
+            retry_at = self._failed.get(url)
+            if retry_at is None:
+                return False
+            if time.monotonic() < retry_at:
+                return True
+            del self._failed[url]
+            return False
+
+    def cache_url(self, url: str) -> bool:
+        """Download one image and store all of its variants. Returns True on success.
+
+        A URL that failed is not tried again for failed_retry_interval seconds, so
+        reruns fall back to the original URL without waiting on another download.
+        """
+        if self.is_cached(url):
+            return True
+        if self._recently_failed(url):
+            return False
+        try:
+            raw = self._fetch(url)
+            for variant, max_edge in self.variants.items():
+                self._store(self._filename(url, variant), self._downscale(raw, max_edge))
+            return True
+        except Exception:
+            with self._lock:
+                self._failed[url] = time.monotonic() + self.failed_retry_interval
+            return False
+
+    def prefetch(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """Download and downscale several images concurrently."""
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        workers = min(self.max_workers, len(unique_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self.cache_url, unique_urls)
+            return dict(zip(unique_urls, results))
+
+    def get(self, url: str, variant: str = 'display') -> Optional[str]:
+        """Return the local path of a cached variant, fetching it on a miss.
+
+        Returns None when the image cannot be downloaded or decoded, so callers
+        can fall back to the original URL.
+        """
+        if variant not in self.variants:
+            raise ValueError(f"Unknown image variant: {variant}")
+        name = self._filename(url, variant)
+        if self._touch(name):
+            return self._path(name)
+        if self.cache_url(url) and self._touch(name):
+            return self._path(name)
+        return None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
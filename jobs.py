@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+from scrape import extract_asin
+from pipeline import ANALYSIS_STAGES, AnalysisCancelled, analyze_product
+
+# Finished results are reused for this many seconds instead of analyzing again
+JOB_RESULT_TTL = 300
+
+
+class Job:
+    """A background product analysis and its progress."""
+
+    def __init__(self, key: str, url: str):
+        self.key = key
+        self.url = url
+        self.status = 'pending'  # pending, running, done, failed or cancelled
+        self.stage: Optional[str] = None
+        self.progress = 0.0
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        # Sessions waiting for the result; the job is cancelled only once all of them have cancelled
+        self.waiters: Set[str] = set()
+        self._cancel_requested = threading.Event()
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ('pending', 'running')
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == 'done' and 'error' not in (self.result or {}).get('data', {})
+
+    def cancel(self):
+        """Request cancellation; a running job stops at its next stage boundary."""
+        self._cancel_requested.set()
+        if self.future is not None and self.future.cancel():
+            self._finish('cancelled')
+
+    def enter_stage(self, stage: str):
+        if self._cancel_requested.is_set():
+            raise AnalysisCancelled()
+        self.stage = stage
+        self.progress = ANALYSIS_STAGES.index(stage) / len(ANALYSIS_STAGES)
+
+    def _finish(self, status: str):
+        self.status = status
+        self.finished_at = time.time()
+        if status == 'done':
+            self.progress = 1.0
+
+
+class JobManager:
+    """Runs product analyses in a thread pool, one job per product at a time.
+
+    Submitting a product that is already being analyzed, or that was analyzed
+    successfully within JOB_RESULT_TTL, returns the existing job instead of starting a new one.
+    Callers identify themselves with a waiter id so one caller cannot cancel a job others still need.
+    """
+
+    def __init__(self, max_workers: int = 4, analyze: Callable[..., Dict] = analyze_product):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis')
+        self._analyze = analyze
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, url: str, waiter: str) -> Job:
+        key = extract_asin(url) or url
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            # A job that is stopping would end 'cancelled' for the new waiter, so start a fresh one
+            reusable = job is not None and not job.cancel_requested and (job.is_active or job.succeeded)
+            if not reusable:
+                job = Job(key, url)
+                self._jobs[key] = job
+                job.future = self._executor.submit(self._run, job)
+            job.waiters.add(waiter)
+            return job
+
+    def get(self, key: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key: str, waiter: str) -> bool:
+        """Stop waiting for a job, cancelling it if no other waiter remains. Returns True if it was cancelled."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return False
+            job.waiters.discard(waiter)
+            if job.waiters or not job.is_active:
+                return False
+            # Under the lock so no submit can attach to the job between the check and the cancel
+            job.cancel()
+            return True
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL. Caller holds the lock."""
+        cutoff = time.time() - JOB_RESULT_TTL
+        for key in [key for key, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[key]
+
+    def _run(self, job: Job):
+        job.status = 'running'
+        try:
+            job.result = self._analyze(job.url, on_stage=job.enter_stage)
+            job._finish('done')
+        except AnalysisCancelled:
+            job._finish('cancelled')
+        except Exception as e:
+            job.error = str(e)
+            job._finish('failed')
@@ -0,0 +1,165 @@
+"""Load test for the chatbot using a local stand-in for the Gemini model.
+
+Example:
+    python loadtest.py --sessions 50 --turns 5 --latency 0.8 --tokens-per-second 60
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from chat import generate_response
+from sample_data import sample_product
+
+APP_STAGES = ['file_io', 'serialize', 'prompt_build', 'client_build']
+
+QUESTIONS = [
+    "How long does the battery last?",
+    "Is the display good for watching videos?",
+    "What do reviewers say about the camera?",
+    "Which processor does it use?",
+    "Is it worth the price?",
+]
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Stands in for genai.GenerativeModel with a fixed latency and token rate."""
+
+    def __init__(self, latency: float, tokens_per_second: float, response_tokens: int):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        generation_time = self.response_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        time.sleep(self.latency + generation_time)
+        return StubResponse(' '.join(['token'] * self.response_tokens))
+
+
+def write_sample_product(path: str, num_reviews: int = 100, num_specs: int = 40):
+    product = sample_product(num_reviews=num_reviews, num_specs=num_specs, num_images=6)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(product, f, indent=4, ensure_ascii=False)
+
+
+def run_session(session_id: int, turns: int, think_time: float, path: str, model_factory,
+                results: List[Dict], lock: threading.Lock):
+    """Simulate one user asking several questions in a row."""
+    for turn in range(turns):
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            response = generate_response(QUESTIONS[(session_id + turn) % len(QUESTIONS)], path=path,
+                                         model_factory=model_factory, timings=timings)
+            timings['error'] = response.startswith('Error ')
+        except Exception:
+            # A turn that raises counts as an error instead of ending the session unnoticed
+            timings['error'] = True
+        timings['total'] = time.perf_counter() - start
+        with lock:
+            results.append(timings)
+        if think_time:
+            time.sleep(think_time)
+
+
+def run_load_test(sessions: int = 50, turns: int = 5, latency: float = 0.8, tokens_per_second: float = 60,
+                  response_tokens: int = 120, think_time: float = 0, num_reviews: int = 100) -> Dict:
+    """Drive concurrent chat sessions against the stub model and summarize the timings."""
+    results: List[Dict] = []
+    lock = threading.Lock()
+
+    def model_factory():
+        return StubModel(latency, tokens_per_second, response_tokens)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'product_data.json')
+        write_sample_product(path, num_reviews=num_reviews)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            futures = [
+                executor.submit(run_session, session_id, turns, think_time, path, model_factory, results, lock)
+                for session_id in range(sessions)
+            ]
+            # Re-raise anything that escaped a session rather than reporting a short run as clean
+            for future in futures:
+                future.result()
+        wall_time = time.perf_counter() - start
+
+    completed = [timings for timings in results if not timings['error']]
+    totals = np.array([timings['total'] for timings in completed]) * 1000
+    report = {
+        'sessions': sessions,
+        'turns': len(results),
+        'errors': len(results) - len(completed),
+        'wall_time_s': wall_time,
+        'throughput_tps': len(completed) / wall_time if wall_time else 0,
+        'latency_ms': {},
+        'stages_ms': {},
+    }
+    if not completed:
+        return report
+
+    for name, q in [('p50', 50), ('p95', 95), ('p99', 99)]:
+        report['latency_ms'][name] = float(np.percentile(totals, q))
+
+    app_time = sum(timings[stage] for timings in completed for stage in APP_STAGES)
+    for stage in APP_STAGES + ['model_call']:
+        values = np.array([timings[stage] for timings in completed]) * 1000
+        report['stages_ms'][stage] = {
+            'mean': float(values.mean()),
+            'p95': float(np.percentile(values, 95)),
+            # Share of the time spent in the app itself, excluding the model call
+            'app_share': float(values.sum() / 1000 / app_time) if stage in APP_STAGES and app_time else None,
+        }
+    return report
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Sessions: {report['sessions']}  turns: {report['turns']}  errors: {report['errors']}",
+        f"Wall time: {report['wall_time_s']:.2f} s  throughput: {report['throughput_tps']:.2f} turns/s",
+    ]
+    if report['latency_ms']:
+        latency = report['latency_ms']
+        lines.append(f"Latency: p50 {latency['p50']:.1f} ms  p95 {latency['p95']:.1f} ms  p99 {latency['p99']:.1f} ms")
+        lines.append("Stage           mean ms    p95 ms   app share")
+        for stage, stats in report['stages_ms'].items():
+            share = f"{stats['app_share'] * 100:9.1f}%" if stats['app_share'] is not None else '         -'
+            lines.append(f"{stage:<14}{stats['mean']:9.2f}{stats['p95']:10.2f}{share}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the chatbot with a stub model.')
+    parser.add_argument('--sessions', type=int, default=50, help='concurrent simulated users')
+    parser.add_argument('--turns', type=int, default=5, help='questions per user')
+    parser.add_argument('--latency', type=float, default=0.8, help='stub model latency before the first token, in seconds')
+    parser.add_argument('--tokens-per-second', type=float, default=60, help='stub model generation rate')
+    parser.add_argument('--response-tokens', type=int, default=120, help='tokens per stub response')
+    parser.add_argument('--think-time', type=float, default=0, help='pause between a user\'s questions, in seconds')
+    parser.add_argument('--reviews', type=int, default=100, help='reviews in the sample product')
+    parser.add_argument('--json', action='store_true', help='print the raw report as JSON')
+    args = parser.parse_args()
+
+    report = run_load_test(
+        sessions=args.sessions,
+        turns=args.turns,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        think_time=args.think_time,
+        num_reviews=args.reviews,
+    )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
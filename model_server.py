@@ -0,0 +1,346 @@
+"""Shared model server: one process owns the BERT model and serves every Streamlit process.
+
+Requests from all clients are collected into micro-batches, so concurrent sessions
+share forward passes. Start it with:
+
+    python model_server.py --address unix:/tmp/insightcart-model.sock
+
+analyzer.py connects to the address in INSIGHTCART_MODEL_SERVER (default below)
+and falls back to in-process inference only when nothing is listening; a slow
+reply is waited for, up to the deadlines in REQUEST_TIMEOUTS.
+"""
+import base64
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MODEL_SERVER_ENV = 'INSIGHTCART_MODEL_SERVER'
+DEFAULT_ADDRESS = 'unix:/tmp/insightcart-model.sock' if hasattr(socket, 'AF_UNIX') else 'tcp:127.0.0.1:8765'
+
+# Seconds to wait before trying a server that was not listening again
+RETRY_INTERVAL = 30
+# Seconds to wait for a reply, including time queued behind other clients' batches.
+# CPU BERT batches are slow under load, so embeddings get the longest deadline.
+MODEL_TIMEOUT_ENV = 'INSIGHTCART_MODEL_SERVER_TIMEOUT'
+REQUEST_TIMEOUTS = {'embed': 300.0, 'sentiment': 60.0}
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+_HEADER = struct.Struct('!I')
+
+
+class ModelServerError(Exception):
+    """Raised by the client when a request fails or times out."""
+
+
+class ModelServerUnavailable(ModelServerError):
+    """Raised by the client when nothing is listening; callers fall back to in-process models."""
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """Turn 'unix:/path' or 'tcp:host:port' into a socket family and address."""
+    scheme, _, rest = address.partition(':')
+    if scheme == 'unix':
+        return socket.AF_UNIX, rest
+    if scheme == 'tcp':
+        host, _, port = rest.rpartition(':')
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    raise ValueError(f"Unsupported model server address: {address}")
+
+
+def send_message(sock: socket.socket, message: Dict):
+    payload = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError('Connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Dict:
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, length).decode('utf-8'))
+
+
+def encode_array(array: np.ndarray) -> Dict:
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return {'shape': list(array.shape), 'data': base64.b64encode(array.tobytes()).decode('ascii')}
+
+
+def decode_array(payload: Dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(payload['data']), dtype=np.float32).reshape(payload['shape'])
+
+
+class ModelClient:
+    """Client for the model server, keeping one connection per thread.
+
+    timeouts maps an op to the seconds to wait for its reply; ops without an
+    entry wait DEFAULT_REQUEST_TIMEOUT.
+    """
+
+    def __init__(self, address: str, timeouts: Optional[Dict[str, float]] = None):
+        self.address = address
+        self.family, self.sock_address = parse_address(address)
+        self.timeouts = dict(REQUEST_TIMEOUTS if timeouts is None else timeouts)
+        self._local = threading.local()
+        self._unavailable_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            sock.settimeout(DEFAULT_REQUEST_TIMEOUT)
+            try:
+                sock.connect(self.sock_address)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _drop_connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def request(self, message: Dict) -> Dict:
+        if not self.available:
+            raise ModelServerUnavailable(f"Model server at {self.address} is unavailable")
+        timeout = self.timeouts.get(message.get('op'), DEFAULT_REQUEST_TIMEOUT)
+        # Retry once so a connection the server closed since the last call is replaced
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                sock.settimeout(timeout)
+                send_message(sock, message)
+                response = recv_message(sock)
+                break
+            except (OSError, ConnectionError, ValueError) as e:
+                self._drop_connection()
+                # Nothing is listening: skip the server for a while instead of failing every call
+                if isinstance(e, (FileNotFoundError, ConnectionRefusedError)):
+                    self._unavailable_until = time.monotonic() + RETRY_INTERVAL
+                    raise ModelServerUnavailable(str(e))
+                # The server is busy, not gone; resending would only repeat the queued work
+                if isinstance(e, socket.timeout):
+                    raise ModelServerError(f"Model server did not reply within {timeout:g} s")
+                if attempt == 1:
+                    raise ModelServerError(str(e))
+        if not response.get('ok'):
+            raise ModelServerError(response.get('error', 'Unknown model server error'))
+        return response
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return decode_array(self.request({'op': 'embed', 'texts': texts})['embeddings'])
+
+    def sentiment(self, texts: List[str]) -> List[Dict[str, float]]:
+        return self.request({'op': 'sentiment', 'texts': texts})['scores']
+
+    def stats(self) -> Dict:
+        return self.request({'op': 'stats'})['stats']
+
+
+_client: Optional[ModelClient] = None
+_client_lock = threading.Lock()
+
+
+def _configured_timeouts() -> Dict[str, float]:
+    """REQUEST_TIMEOUTS, with every op's deadline replaced by INSIGHTCART_MODEL_SERVER_TIMEOUT when it is set."""
+    override = os.environ.get(MODEL_TIMEOUT_ENV)
+    if not override:
+        return dict(REQUEST_TIMEOUTS)
+    return {op: float(override) for op in REQUEST_TIMEOUTS}
+
+
+def get_client() -> Optional[ModelClient]:
+    """Shared client for the configured address, or None when the server is disabled with 'off'."""
+    global _client
+    address = os.environ.get(MODEL_SERVER_ENV, DEFAULT_ADDRESS)
+    if address == 'off':
+        return None
+    timeouts = _configured_timeouts()
+    with _client_lock:
+        if _client is None or _client.address != address or _client.timeouts != timeouts:
+            _client = ModelClient(address, timeouts)
+        return _client
+
+
+class MicroBatcher:
+    """Collects texts from many callers and processes them together.
+
+    A batch is run when it reaches max_batch_size texts or when max_wait seconds
+    have passed since its first request arrived, whichever comes first.
+    """
+
+    def __init__(self, process: Callable[[List[str]], List], max_batch_size: int = 64, max_wait: float = 0.01):
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self._queue: 'queue.Queue[Tuple[List[str], Future]]' = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        future: Future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _collect(self) -> List[Tuple[List[str], Future]]:
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += len(texts)
+            try:
+                results = self.process(texts)
+            except Exception:
+                # Run each request alone so only the one that caused the failure gets the error
+                for item_texts, future in batch:
+                    try:
+                        future.set_result(self.process(item_texts))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, future in batch:
+                future.set_result(results[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+            try:
+                response = self.server.dispatch(message)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class _ServerMixin:
+    daemon_threads = True
+    # Every Streamlit session thread may connect at once
+    request_queue_size = 128
+
+    def setup_batchers(self, max_batch_size: int, max_wait: float):
+        # The model lives only in this process; clients must not route back to it
+        os.environ[MODEL_SERVER_ENV] = 'off'
+        import analyzer
+
+        self.embed_batcher = MicroBatcher(analyzer.get_bert_embeddings_batch, max_batch_size, max_wait)
+        self.sentiment_batcher = MicroBatcher(
+            lambda texts: [analyzer.analyze_sentiment(text) for text in texts], max_batch_size, max_wait
+        )
+
+    def dispatch(self, message: Dict) -> Dict:
+        op = message.get('op')
+        if op in ('embed', 'sentiment'):
+            texts = message.get('texts')
+            # Reject bad input here so it never reaches a batch shared with other clients
+            if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+                return {'ok': False, 'error': "'texts' must be a non-empty list of strings"}
+        if op == 'embed':
+            embeddings = self.embed_batcher.submit(texts).result()
+            return {'ok': True, 'embeddings': encode_array(np.asarray(embeddings))}
+        if op == 'sentiment':
+            return {'ok': True, 'scores': self.sentiment_batcher.submit(texts).result()}
+        if op == 'stats':
+            return {'ok': True, 'stats': {
+                name: {'batches': batcher.batches, 'requests': batcher.requests, 'texts': batcher.texts}
+                for name, batcher in [('embed', self.embed_batcher), ('sentiment', self.sentiment_batcher)]
+            }}
+        return {'ok': False, 'error': f"Unknown op: {op}"}
+
+
+class ThreadingTCPModelServer(_ServerMixin, socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class ThreadingUnixModelServer(_ServerMixin, socketserver.ThreadingUnixStreamServer):
+        pass
+
+
+def create_server(address: str, max_batch_size: int = 64, max_wait: float = 0.01):
+    family, sock_address = parse_address(address)
+    if family == getattr(socket, 'AF_UNIX', None):
+        # Remove a socket file left behind by a previous run
+        if os.path.exists(sock_address):
+            os.remove(sock_address)
+        server = ThreadingUnixModelServer(sock_address, _RequestHandler)
+    else:
+        server = ThreadingTCPModelServer(sock_address, _RequestHandler)
+    server.setup_batchers(max_batch_size, max_wait)
+    return server
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve BERT embeddings and VADER sentiment to InsightCart processes.')
+    configured_address = os.environ.get(MODEL_SERVER_ENV, DEFAULT_ADDRESS)
+    parser.add_argument('--address', default=DEFAULT_ADDRESS if configured_address == 'off' else configured_address,
+                        help="'unix:/path/to.sock' or 'tcp:host:port'")
+    parser.add_argument('--max-batch-size', type=int, default=64, help='texts per forward pass')
+    parser.add_argument('--max-wait-ms', type=float, default=10, help='longest wait for a batch to fill')
+    args = parser.parse_args()
+
+    server = create_server(args.address, args.max_batch_size, args.max_wait_ms / 1000)
+    print(f"Model server listening on {args.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        family, sock_address = parse_address(args.address)
+        if family == getattr(socket, 'AF_UNIX', None) and os.path.exists(sock_address):
+            os.remove(sock_address)
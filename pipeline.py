@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from scrape import extract_asin, extract_product, fetch_page, parse_page
+from analyzer import calculate_metacritic_score, generate_product_summary
+
+MAX_COMPARE_PRODUCTS = 5
+
+ANALYSIS_STAGES = ['fetching', 'parsing', 'scoring', 'summarizing']
+
+
+class AnalysisCancelled(Exception):
+    """Raised by a stage callback to stop an analysis between stages."""
+
+
+def analyze_product(url: str, on_stage: Optional[Callable[[str], None]] = None) -> Dict:
+    """Scrape a product and compute its score and summary.
+
+    If given, on_stage is called with each name in ANALYSIS_STAGES before that
+    stage starts, and may raise AnalysisCancelled to stop the analysis.
+    """
+    def enter(stage):
+        if on_stage:
+            on_stage(stage)
+
+    try:
+        enter('fetching')
+        page = fetch_page(url)
+        enter('parsing')
+        data = extract_product(parse_page(page))
+        data['asin'] = extract_asin(url)
+    except AnalysisCancelled:
+        raise
+    except Exception as e:
+        data = {'error': str(e)}
+
+    result = {'url': url, 'data': data, 'score_details': None, 'summary': ''}
+    if 'error' in data:
+        return result
+
+    enter('scoring')
+    result['score_details'] = calculate_metacritic_score(data)
+    enter('summarizing')
+    result['summary'] = generate_product_summary(data)
+    return result
+
+
+def compare_products(urls: List[str], analyze: Callable[[str], Dict] = analyze_product,
+                     max_workers: int = MAX_COMPARE_PRODUCTS) -> Iterator[Tuple[int, Dict]]:
+    """Analyze several products concurrently.
+
+    Yields (index, result) pairs in completion order so callers can show each
+    product as soon as it is ready. The models and caches in the analyzer
+    module are shared by all workers.
+    """
+    if not urls:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        futures = {executor.submit(analyze, url): index for index, url in enumerate(urls)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'url': urls[index], 'data': {'error': str(e)}, 'score_details': None, 'summary': ''}
+            yield index, result
@@ -0,0 +1,140 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+PRICE_HISTORY_DIR = '.price_history'
+
+# One append-only binary file per column in each product's directory
+COLUMNS = {
+    'timestamp': np.int64,   # seconds since the epoch, never decreasing
+    'price': np.int64,       # whole currency units
+    'rating': np.float32,    # average stars from the rating distribution, NaN if unknown
+}
+
+_PRICE_RE = re.compile(r'\d[\d,]*')
+
+
+def parse_price(text: str) -> Optional[int]:
+    """Parse a scraped price such as '24,999.' into an integer."""
+    match = _PRICE_RE.search(text or '')
+    if not match:
+        return None
+    return int(match.group(0).replace(',', ''))
+
+
+def average_rating(rating_distribution: Dict[str, float]) -> float:
+    """Average star rating from a percentage distribution, or NaN when it is empty."""
+    total = sum(rating_distribution.values()) if rating_distribution else 0
+    if total <= 0:
+        return float('nan')
+    return sum(float(stars) * percentage for stars, percentage in rating_distribution.items()) / total
+
+
+class PriceHistoryStore:
+    """Per-product price history kept in compact, memory-mapped column files."""
+
+    def __init__(self, root: str = PRICE_HISTORY_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _column_path(self, asin: str, column: str) -> str:
+        safe_asin = re.sub(r'[^A-Za-z0-9_-]', '_', asin)
+        return os.path.join(self.root, safe_asin, f"{column}.bin")
+
+    def _map_column(self, path: str, dtype, length: int) -> np.ndarray:
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+
+    def _row_count(self, asin: str) -> int:
+        """Rows present in every column; a crash between column writes can leave some a row longer."""
+        lengths = []
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(asin, column)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths.append(size // np.dtype(dtype).itemsize)
+        return min(lengths)
+
+    def _columns(self, asin: str) -> Dict[str, np.ndarray]:
+        """Memory-map every column, trimmed to the rows present in all of them."""
+        rows = self._row_count(asin)
+        return {
+            column: self._map_column(self._column_path(asin, column), dtype, rows)
+            for column, dtype in COLUMNS.items()
+        }
+
+    def append(self, asin: str, price: int, rating: float = float('nan'), timestamp: Optional[int] = None):
+        """Append one sample to a product's history.
+
+        Samples must arrive in time order. A timestamp earlier than the last stored
+        one (for example after the system clock steps back) is stored as that last
+        timestamp instead, so the sample is kept and the column stays sorted.
+        """
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        with self._lock:
+            os.makedirs(os.path.dirname(self._column_path(asin, 'timestamp')), exist_ok=True)
+            rows = self._row_count(asin)
+            # Drop any partial row left by an interrupted write so the columns stay aligned
+            for column, dtype in COLUMNS.items():
+                path = self._column_path(asin, column)
+                if os.path.exists(path) and os.path.getsize(path) != rows * np.dtype(dtype).itemsize:
+                    os.truncate(path, rows * np.dtype(dtype).itemsize)
+
+            timestamps = self._columns(asin)['timestamp']
+            # Keep timestamps sorted so window queries can binary search
+            if len(timestamps) and timestamp < timestamps[-1]:
+                timestamp = int(timestamps[-1])
+            del timestamps
+
+            row = {'timestamp': timestamp, 'price': price, 'rating': rating}
+            for column, dtype in COLUMNS.items():
+                with open(self._column_path(asin, column), 'ab') as f:
+                    f.write(np.array([row[column]], dtype=dtype).tobytes())
+
+    def record(self, asin: str, product_data: Dict, timestamp: Optional[int] = None) -> bool:
+        """Append the price and rating from scraped product data. Returns False if there is no price."""
+        price = parse_price(product_data.get('price', ''))
+        if price is None:
+            return False
+        self.append(asin, price, average_rating(product_data.get('rating_distribution')), timestamp)
+        return True
+
+    def _window(self, columns: Dict[str, np.ndarray], start: Optional[int], end: Optional[int]) -> slice:
+        timestamps = columns['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+        return slice(lo, hi)
+
+    def history(self, asin: str, start: Optional[int] = None, end: Optional[int] = None,
+                max_points: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Samples between start and end (inclusive), evenly thinned to at most max_points."""
+        columns = self._columns(asin)
+        window = self._window(columns, start, end)
+        rows = window.stop - window.start
+        step = 1
+        if max_points and rows > max_points:
+            step = int(np.ceil(rows / max_points))
+        return {column: np.array(values[window][::step]) for column, values in columns.items()}
+
+    def stats(self, asin: str, start: Optional[int] = None, end: Optional[int] = None,
+              percentiles: Iterable[float] = (10, 50, 90)) -> Dict[str, float]:
+        """Count, min, max, latest and percentiles of the price between start and end."""
+        columns = self._columns(asin)
+        prices = columns['price'][self._window(columns, start, end)]
+        if len(prices) == 0:
+            return {'count': 0}
+        result = {
+            'count': int(len(prices)),
+            'min': int(prices.min()),
+            'max': int(prices.max()),
+            'latest': int(prices[-1]),
+        }
+        percentiles = list(percentiles)
+        for q, value in zip(percentiles, np.percentile(prices, percentiles)):
+            result[f"p{q:g}"] = float(value)
+        return result
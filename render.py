@@ -0,0 +1,348 @@
+import html
+import math
+from typing import Dict, List, Tuple, Union
+
+REVIEWS_PER_PAGE = 10
+
+# All page styles, injected once per script run instead of once per section
+STYLES = """
+<style>
+/* Global Styles */
+.stApp {
+    background-color: #121212;
+    color: #e0e0e0;
+}
+
+/* Product Title and Badge */
+.product-title {
+    font-size: 32px;
+    color: #90caf9;
+    margin-bottom: 24px;
+    font-weight: 600;
+    letter-spacing: -0.5px;
+    line-height: 1.2;
+    transition: color 0.3s ease;
+}
+.product-title:hover {
+    color: #64b5f6;
+}
+.launch-badge {
+    background: linear-gradient(45deg, #ff4081, #e91e63);
+    color: white;
+    padding: 6px 12px;
+    border-radius: 20px;
+    font-size: 14px;
+    font-weight: 500;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    box-shadow: 0 2px 4px rgba(233, 30, 99, 0.2);
+    display: inline-block;
+    margin-bottom: 16px;
+}
+.product-image {
+    border-radius: 12px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    transition: transform 0.3s ease;
+}
+.product-image:hover {
+    transform: scale(1.02);
+}
+
+/* Price Tag */
+.price-tag {
+    font-size: 42px;
+    background: linear-gradient(45deg, #2e7d32, #43a047);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    font-weight: 700;
+    margin: 20px 0;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
+}
+
+/* Metacritic Score */
+.metacritic-score {
+    font-size: 48px;
+    font-weight: bold;
+    text-align: center;
+    padding: 20px;
+    border-radius: 10px;
+    margin: 20px 0;
+}
+.high-score { color: #6c3; background-color: #f0f8f0; }
+.mid-score { color: #fc3; background-color: #f8f7f0; }
+.low-score { color: #f00; background-color: #f8f0f0; }
+
+/* Specifications */
+.spec-grid {
+    display: grid;
+    grid-template-columns: repeat(3, minmax(0, 1fr));
+    gap: 0 16px;
+}
+.spec-container {
+    background: #1e1e1e;
+    border-radius: 12px;
+    padding: 20px;
+    box-shadow: 0 4px 6px rgba(255,255,255,0.1);
+    margin: 16px 0;
+    transition: transform 0.2s ease;
+}
+.spec-container:hover {
+    transform: translateY(-2px);
+}
+.spec-label {
+    color: #90a4ae;
+    font-size: 14px;
+    font-weight: 500;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+    margin-bottom: 8px;
+}
+.spec-value {
+    font-weight: 600;
+    color: #e0e0e0;
+    font-size: 16px;
+    line-height: 1.5;
+}
+
+/* Review Container */
+.review-stats {
+    background-color: #1e1e1e;
+    padding: 24px;
+    border-radius: 16px;
+    box-shadow: 0 4px 12px rgba(255,255,255,0.08);
+    margin: 24px 0;
+}
+.review-card {
+    width: 75%;
+}
+.review-title {
+    margin: 0 0 8px;
+}
+.review-meta {
+    display: flex;
+    align-items: center;
+    gap: 12px;
+    margin-bottom: 10px;
+}
+.review-stars {
+    color: #ffd700;
+    font-size: 20px;
+    letter-spacing: 2px;
+}
+.review-stars-empty {
+    color: rgba(255, 215, 0, 0.3);
+}
+.review-content {
+    background: rgba(255, 255, 255, 0.03);
+    padding: 15px;
+    border-radius: 10px;
+    margin: 10px 0;
+}
+.review-author {
+    color: #90caf9;
+    margin-top: 10px;
+}
+.review-author span {
+    color: #64b5f6;
+    font-weight: 500;
+}
+.review-divider {
+    border-color: rgba(255,255,255,0.1);
+    margin: 20px 0;
+}
+
+/* Common Phrases */
+.common-phrase {
+    background: #1e1e1e;
+    color: #90caf9;
+    padding: 8px 16px;
+    border-radius: 20px;
+    margin: 8px 0;
+    display: inline-block;
+    font-weight: 500;
+    transition: all 0.2s ease;
+}
+.common-phrase:hover {
+    background: #2c2c2c;
+    transform: scale(1.02);
+}
+
+/* Rating Distribution */
+.rating-bar {
+    background: linear-gradient(90deg, #ffd54f 0%, #ffb300 100%);
+    border-radius: 4px;
+    height: 8px;
+    transition: width 0.3s ease;
+}
+.rating-container {
+    background: #1e1e1e;
+    padding: 16px;
+    border-radius: 12px;
+    box-shadow: 0 2px 4px rgba(255,255,255,0.05);
+    margin: 8px 0;
+}
+
+/* Product Comparison */
+.compare-title {
+    font-size: 18px;
+    font-weight: 600;
+    color: #90caf9;
+    min-height: 4.5em;
+    overflow: hidden;
+}
+.compare-row {
+    display: flex;
+    justify-content: space-between;
+    padding: 6px 0;
+    border-bottom: 1px solid #2c2c2c;
+}
+
+/* Section Headers */
+.section-header {
+    font-size: 24px;
+    color: #90caf9;
+    margin: 32px 0 16px;
+    font-weight: 600;
+    border-bottom: 3px solid #2c2c2c;
+    padding-bottom: 8px;
+}
+</style>
+"""
+
+
+def _escape(value) -> str:
+    return html.escape(str(value))
+
+
+def build_section_header(title: str) -> str:
+    return f"<h2 class='section-header'>{title}</h2>"
+
+
+def build_title_html(full_title: str) -> str:
+    """Launch badge and shortened product title."""
+    short_title = full_title.split('|')[0].strip()
+    return (
+        "<span class='launch-badge'>NEW LAUNCH</span>"
+        f"<h1 class='product-title'>{_escape(short_title)}</h1>"
+    )
+
+
+def build_analysis_html(summary: str) -> str:
+    """Product analysis card with one line per summary point."""
+    points = ''.join(
+        f"<div class='spec-value'>{_escape(point.strip())}</div>"
+        for point in summary.split('\n') if point.strip()
+    )
+    return build_section_header('🔍 Product Analysis') + f"<div class='spec-container'>{points}</div>"
+
+
+def build_price_html(price: str) -> str:
+    return f"<div class='price-tag'>₹{_escape(price)}</div>"
+
+
+def build_metacritic_html(final_score: int) -> str:
+    score_class = 'high-score' if final_score >= 75 else 'mid-score' if final_score >= 50 else 'low-score'
+    return f"<div class='metacritic-score {score_class}'>{final_score}</div>"
+
+
+def build_phrases_html(phrases: List[str]) -> str:
+    badges = ''.join(f"<span class='common-phrase'>{_escape(phrase)}</span>" for phrase in phrases)
+    return build_section_header('💬 Common Phrases') + badges
+
+
+def build_rating_distribution_html(rating_distribution: Dict[str, float]) -> str:
+    """Rating bars for 5 down to 1 stars, or an empty string when there are no ratings."""
+    if not rating_distribution or sum(rating_distribution.values()) <= 0:
+        return ''
+    rows = []
+    for stars in ['5', '4', '3', '2', '1']:
+        percentage = rating_distribution.get(stars, 0)
+        rows.append(
+            "<div class='rating-container'>"
+            "<div style='display: flex; align-items: center; justify-content: space-between;'>"
+            f"<span style='color: #ffa000; font-weight: 500;'>{stars}★</span>"
+            "<div style='flex-grow: 1; margin: 0 10px;'>"
+            f"<div class='rating-bar' style='width: {percentage}%;'></div>"
+            "</div>"
+            f"<span style='color: #455a64; font-weight: 500;'>{percentage}%</span>"
+            "</div>"
+            "</div>"
+        )
+    return build_section_header('⭐ Rating Distribution') + ''.join(rows)
+
+
+def build_spec_grid_html(specifications: Dict[str, Union[str, List[str]]]) -> str:
+    """All specification cards laid out in a three column grid."""
+    cards = []
+    for key, value in specifications.items():
+        if isinstance(value, list):
+            value = ', '.join(value)
+        cards.append(
+            "<div class='spec-container'>"
+            f"<div class='spec-label'>{_escape(key)}</div>"
+            f"<div class='spec-value'>{_escape(value)}</div>"
+            "</div>"
+        )
+    return f"<div class='spec-grid'>{''.join(cards)}</div>"
+
+
+def build_review_html(review: Dict) -> str:
+    try:
+        rating = float(review.get('rating', 0) or 0)
+    except (ValueError, TypeError):
+        rating = 0
+    rating_int = max(0, min(5, int(rating)))
+    stars_filled = '★' * rating_int
+    stars_empty = '★' * (5 - rating_int)
+    return (
+        "<div class='review-card'>"
+        f"<h3 class='review-title'>{_escape(review.get('title') or 'Customer Review')}</h3>"
+        "<div class='review-meta'>"
+        f"<span class='review-stars'>{stars_filled}<span class='review-stars-empty'>{stars_empty}</span></span>"
+        f"<span style='color: #ffd700'>{rating}/5</span>"
+        f"<span style='color: #90caf9; opacity: 0.8'>{_escape(review.get('review_date', ''))}</span>"
+        "</div>"
+        f"<div class='review-content'>{_escape(review.get('content', ''))}</div>"
+        f"<div class='review-author'>Reviewed by <span>{_escape(review.get('reviewer_name') or 'Anonymous')}</span></div>"
+        "</div>"
+        "<hr class='review-divider'>"
+    )
+
+
+def build_reviews_html(reviews: List[Dict]) -> str:
+    return ''.join(build_review_html(review) for review in reviews)
+
+
+def build_comparison_card_html(result: Dict) -> str:
+    """Fixed-layout card for one product so comparison columns line up row by row."""
+    data = result['data']
+    if 'error' in data:
+        return f"<div class='compare-title'>{_escape(result['url'])}</div><div class='spec-value'>Error: {_escape(data['error'])}</div>"
+
+    score_details = result['score_details']
+    component_scores = score_details['component_scores']
+    rows = [
+        ('Review Analysis', component_scores['review_score']),
+        ('Rating Distribution', component_scores['rating_score']),
+        ('Feature Analysis', component_scores['feature_score']),
+    ]
+    rows_html = ''.join(
+        f"<div class='compare-row'><span class='spec-label'>{label}</span><span class='spec-value'>{value:.0f}</span></div>"
+        for label, value in rows
+    )
+    short_title = (data.get('title') or result['url']).split('|')[0].strip()
+    price_html = build_price_html(data['price']) if data.get('price') else "<div class='price-tag'>—</div>"
+    return (
+        f"<div class='compare-title'>{_escape(short_title)}</div>"
+        + price_html
+        + build_metacritic_html(score_details['final_score'])
+        + rows_html
+    )
+
+
+def paginate(items: List, page: int, page_size: int = REVIEWS_PER_PAGE) -> Tuple[List, int, int]:
+    """Return the items on a page, the clamped page index and the page count."""
+    num_pages = max(1, math.ceil(len(items) / page_size))
+    page = max(0, min(page, num_pages - 1))
+    start = page * page_size
+    return items[start:start + page_size], page, num_pages
@@ -0,0 +1,22 @@
+from typing import Dict
+
+
+def sample_product(num_reviews: int = 500, num_specs: int = 60, num_images: int = 0) -> Dict:
+    """Synthetic product in the scraper's output format, for benchmarks and load tests."""
+    return {
+        'title': 'Benchmark Phone 5G (Midnight Black, 8GB RAM, 256GB Storage) | 6000 mAh Battery',
+        'price': '24,999',
+        'image_urls': [f"https://m.media-amazon.com/images/I/img{i}.jpg" for i in range(num_images)],
+        'specifications': {f"Spec {i}": f"Value {i} with some descriptive text" for i in range(num_specs)},
+        'reviews': [
+            {
+                'title': f"Review {i}",
+                'content': 'Great phone, the battery lasts all day and the display is bright. ' * 8,
+                'rating': str(1 + i % 5),
+                'reviewer_name': f"Reviewer {i}",
+                'review_date': 'Reviewed in India on 1 January 2025',
+            }
+            for i in range(num_reviews)
+        ],
+        'rating_distribution': {'5': 60.0, '4': 20.0, '3': 10.0, '2': 5.0, '1': 5.0},
+    }
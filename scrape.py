@@ -1,161 +1,500 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+import soupsieve as sv
+import copy
+import json
+import os
 import re
+import warnings
 
-def scrape_amazon(url):
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract product details
-        product_data = {
-            'title': soup.select_one('#productTitle').text.strip() if soup.select_one('#productTitle') else '',
-            'price': soup.select_one('.a-price-whole').text.strip() if soup.select_one('.a-price-whole') else '',
-            'image_urls': [],
-            'specifications': {},
-            'reviews': [],
-            'rating_distribution': {'5': 0, '4': 0, '3': 0, '2': 0, '1': 0}
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Optional JSON file whose fields override EXTRACTION_SCHEMA, e.g. when Amazon's layout shifts:
+# {"price": {"selectors": [".a-price .a-offscreen"]}, "reviews": {"fields": {"title": {"selectors": ["..."]}}}}
+# An override that cannot be compiled is ignored with a warning.
+SCHEMA_OVERRIDE_ENV = 'INSIGHTCART_SCRAPE_SCHEMA'
+SCHEMA_OVERRIDE_PATH = 'scrape_schema.json'
+
+# Seconds to wait for Amazon to respond before giving up on a page
+FETCH_TIMEOUT = 15
+
+ASIN_RE = re.compile(r'/(?:dp|gp/product|gp/aw/d|product-reviews)/([A-Z0-9]{10})(?:[/?#]|$)', re.IGNORECASE)
+IMAGE_SIZE_SUFFIX_RE = re.compile(r'\._[^.]*\.(jpg|png)')
+HISTOGRAM_LABEL_RE = re.compile(r'(\d+) percent.*?(\d+) stars?')
+REVIEW_RATING_RE = re.compile(r'([\d.]+)\s*out of\s*\d')
+
+# Declarative description of everything scraped from a product page.
+# Each field lists its selectors in priority order: the first one yielding a non-empty
+# value wins. "many" fields collect every match of the first selector that matches at
+# all. Fields with "fields" are groups: every match becomes a record whose sub-fields
+# are collected from inside it. "post" names a function in POST_PROCESSORS.
+EXTRACTION_SCHEMA = {
+    'title': {'selectors': ['#productTitle'], 'post': 'text'},
+    'price': {'selectors': ['.a-price-whole'], 'post': 'text'},
+    'main_image': {'selectors': ['#landingImage, #main-image, #img-canvas img'], 'post': 'src'},
+    'images': {
+        'selectors': ['#altImages img, #imageBlock img, #imgTagWrapperId img'],
+        'many': True,
+        'post': 'src',
+    },
+    'spec_rows': {
+        'selectors': ['#productDetails_techSpec_section_1 tr, #productDetails_db_sections tr, .prodDetTable tr, .a-keyvalue tr'],
+        'fields': {
+            'key': {'selectors': ['th'], 'post': 'text'},
+            'value': {'selectors': ['td'], 'post': 'text'},
+        },
+    },
+    'info_sections': {
+        'selectors': ['#productOverview_feature_div table tr, #detailBullets_feature_div li, #feature-bullets li'],
+        'fields': {
+            'list_item': {'selectors': ['.a-list-item'], 'post': 'text'},
+            'first_td': {'selectors': ['td'], 'post': 'text'},
+            'cells': {'selectors': ['td, th'], 'many': True, 'post': 'text'},
+        },
+    },
+    'key_features': {
+        'selectors': ['#feature-bullets ul li:not(.aok-hidden) span.a-list-item'],
+        'many': True,
+        'post': 'text',
+    },
+    'rating_rows': {
+        'selectors': ['tr[data-hook="rating-distribution-row"]'],
+        'fields': {
+            'stars': {'selectors': ['td:first-child a'], 'post': 'text'},
+            'percentage': {'selectors': ['td:last-child span'], 'post': 'text'},
+        },
+    },
+    'histogram': {'selectors': ['#histogramTable li a'], 'many': True, 'post': 'aria_label'},
+    'reviews': {
+        'selectors': ['div[data-hook="review"], li[id][data-hook="review"]'],
+        'limit': 10,
+        'fields': {
+            'title': {'selectors': ['a[data-hook="review-title"], span[data-hook="review-title"]'], 'post': 'text'},
+            # Body text may sit in a nested span; collapsed reviews use a separate container.
+            # Unlike the original scraper, an empty nested span falls back to the outer
+            # span's own text before the collapsed container, instead of yielding ''.
+            'content': {
+                'selectors': ['span[data-hook="review-body"] span', 'span[data-hook="review-body"]', 'div[data-hook="review-collapsed"]'],
+                'post': 'text',
+            },
+            'rating': {'selectors': ['i[data-hook="review-star-rating"], i[data-hook="cmps-review-star-rating"]'], 'post': 'review_rating'},
+            'reviewer_name': {'selectors': ['span.a-profile-name'], 'post': 'text'},
+            'review_date': {'selectors': ['span[data-hook="review-date"]'], 'post': 'text'},
+        },
+    },
+}
+
+
+def _text(element):
+    return element.text.strip()
+
+
+def _src(element):
+    return element.get('src')
+
+
+def _aria_label(element):
+    return element.get('aria-label', '')
+
+
+def _review_rating(element):
+    # Extract just the number from "X.X out of 5"
+    rating_text = element.text.strip()
+    rating_match = REVIEW_RATING_RE.search(rating_text)
+    return rating_match.group(1) if rating_match else rating_text
+
+
+POST_PROCESSORS = {
+    'text': _text,
+    'src': _src,
+    'aria_label': _aria_label,
+    'review_rating': _review_rating,
+}
+
+
+def _split_top_level(selector, separators):
+    """Split a selector on separator characters outside brackets, parentheses and quotes."""
+    parts, current, depth, quote = [], [], 0, None
+    for char in selector:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+            current.append(char)
+        elif char in '[(':
+            depth += 1
+            current.append(char)
+        elif char in '])':
+            depth -= 1
+            current.append(char)
+        elif depth == 0 and char in separators:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _index_keys(selector):
+    """Keys an element must have to match the selector, used to skip hopeless candidates.
+
+    Returns a list with one (kind, value) key per comma-separated alternative, taken
+    from the rightmost compound selector: its tag name, else its id, else its first
+    class. Returns None when some alternative has no such key.
+    """
+    keys = []
+    for alternative in _split_top_level(selector, ','):
+        compound = _split_top_level(alternative, ' >+~')[-1]
+        tag_match = re.match(r'[a-zA-Z][\w-]*', compound)
+        id_match = re.match(r'#([\w-]+)', compound)
+        class_match = re.match(r'\.([\w-]+)', compound)
+        if tag_match:
+            keys.append(('tag', tag_match.group(0).lower()))
+        elif id_match:
+            keys.append(('id', id_match.group(1)))
+        elif class_match:
+            keys.append(('class', class_match.group(1)))
+        else:
+            return None
+    return keys
+
+
+class CompiledField:
+    """A schema field with its selectors and post-processor resolved."""
+
+    def __init__(self, name, spec):
+        self.name = name
+        if not isinstance(spec['selectors'], list):
+            raise TypeError(f"Selectors for field {name!r} must be a list")
+        self.selectors = list(spec['selectors'])
+        self.matchers = [sv.compile(selector) for selector in self.selectors]
+        self.many = spec.get('many', False)
+        self.limit = spec.get('limit')
+        post = spec.get('post', 'text')
+        if post not in POST_PROCESSORS:
+            raise ValueError(f"Unknown post-processor {post!r} for field {name!r}")
+        self.post = POST_PROCESSORS[post]
+        self.fields = [CompiledField(sub_name, sub_spec) for sub_name, sub_spec in spec.get('fields', {}).items()]
+
+    @property
+    def is_group(self):
+        return bool(self.fields)
+
+
+class _SelectorIndex:
+    """Maps tag names, ids and classes to the (field, selector position) pairs worth testing."""
+
+    def __init__(self, fields):
+        self.by_key = {}
+        self.always = []
+        for field in fields:
+            for position, selector in enumerate(field.selectors):
+                keys = _index_keys(selector)
+                entry = (field, position)
+                if keys is None:
+                    self.always.append(entry)
+                    continue
+                for key in dict.fromkeys(keys):
+                    self.by_key.setdefault(key, []).append(entry)
+
+    def candidates(self, element):
+        seen = set()
+        keys = [('tag', element.name)]
+        element_id = element.get('id')
+        if element_id:
+            keys.append(('id', element_id))
+        keys.extend(('class', cls) for cls in element.get('class', ()))
+        for key in keys:
+            for entry in self.by_key.get(key, ()):
+                if id(entry) not in seen:
+                    seen.add(id(entry))
+                    yield entry
+        yield from self.always
+
+
+class _Collector:
+    """Per-selector matches gathered for a set of fields during a traversal."""
+
+    def __init__(self, fields):
+        self.matches = {field.name: [[] for _ in field.selectors] for field in fields}
+
+    def add(self, field, position, element):
+        bucket = self.matches[field.name][position]
+        # Single-valued fields only ever use the first match of each selector
+        if field.many or not bucket:
+            bucket.append(element)
+
+    def values(self, fields, records=None):
+        values = {}
+        for field in fields:
+            buckets = self.matches[field.name]
+            if field.is_group:
+                values[field.name] = records.get(field.name, []) if records else []
+            elif field.many:
+                elements = next((bucket for bucket in buckets if bucket), [])
+                values[field.name] = [value for value in map(field.post, elements) if value is not None]
+            else:
+                values[field.name] = _first_value(field, buckets)
+        return values
+
+
+def _first_value(field, buckets):
+    """First non-empty value in selector priority order, else the first value seen."""
+    fallback = None
+    for bucket in buckets:
+        if not bucket:
+            continue
+        value = field.post(bucket[0])
+        if value:
+            return value
+        if fallback is None:
+            fallback = value
+    return fallback
+
+
+class ExtractionPlan:
+    """Compiled extraction schema that collects every field in one pass over the document."""
+
+    def __init__(self, schema):
+        self.fields = [CompiledField(name, spec) for name, spec in schema.items()]
+        self.index = _SelectorIndex(self.fields)
+        self.group_indexes = {field.name: _SelectorIndex(field.fields) for field in self.fields if field.is_group}
+
+    def extract(self, soup):
+        """Return a dict of raw field values; groups become lists of record dicts."""
+        collector = _Collector(self.fields)
+        # Open group records: (group field, its collector) pairs per group match
+        records = {field.name: [] for field in self.fields if field.is_group}
+
+        # Iterative pre-order traversal, so matches come back in document order
+        stack = [(child, ()) for child in reversed(soup.contents) if isinstance(child, Tag)]
+        while stack:
+            element, open_groups = stack.pop()
+
+            for group, group_collector in open_groups:
+                for field, position in self.group_indexes[group.name].candidates(element):
+                    if field.matchers[position].match(element):
+                        group_collector.add(field, position, element)
+
+            child_groups = open_groups
+            for field, position in self.index.candidates(element):
+                if not field.matchers[position].match(element):
+                    continue
+                if field.is_group:
+                    if field.limit is not None and len(records[field.name]) >= field.limit:
+                        continue
+                    group_collector = _Collector(field.fields)
+                    records[field.name].append(group_collector)
+                    child_groups = child_groups + ((field, group_collector),)
+                else:
+                    collector.add(field, position, element)
+
+            stack.extend((child, child_groups) for child in reversed(element.contents) if isinstance(child, Tag))
+
+        group_records = {
+            field.name: [group_collector.values(field.fields) for group_collector in records[field.name]]
+            for field in self.fields if field.is_group
         }
-        
-        # Extract images with multiple selector options
-        image_containers = soup.select('#altImages, #imageBlock, #imgTagWrapperId')
-        for container in image_containers:
-            image_elements = container.select('img, div.imgTagWrapper img')
-            for img in image_elements:
-                if 'src' in img.attrs:
-                    img_url = img['src']
-                    # Convert thumbnail URLs to full-size image URLs
-                    img_url = re.sub(r'\._[^.]*\.(jpg|png)', '.' + '\\1', img_url)
-                    if not img_url.endswith('gif') and 'sprite' not in img_url:
-                        if img_url not in product_data['image_urls']:
-                            product_data['image_urls'].append(img_url)
-        
-        # Get main product image with multiple selector options
-        main_img = soup.select_one('#landingImage, #main-image, #img-canvas img')
-        if main_img and 'src' in main_img.attrs:
-            main_img_url = main_img['src']
-            if main_img_url not in product_data['image_urls']:
-                product_data['image_urls'].insert(0, main_img_url)
-        
-        # Extract specifications from multiple possible locations
-        # Try the technical details table first
-        specs_table = soup.select('#productDetails_techSpec_section_1 tr, #productDetails_db_sections tr, .prodDetTable tr, .a-keyvalue tr')
-        for row in specs_table:
-            if row.select_one('th') and row.select_one('td'):
-                key = row.select_one('th').text.strip()
-                value = row.select_one('td').text.strip()
+        return collector.values(self.fields, group_records)
+
+
+def _merge_schema(base, override):
+    merged = copy.deepcopy(base)
+    for name, spec in override.items():
+        if isinstance(spec, dict) and isinstance(merged.get(name), dict):
+            merged[name] = _merge_schema(merged[name], spec)
+        else:
+            merged[name] = spec
+    return merged
+
+
+_plan_cache = {}
+
+
+def get_extraction_plan():
+    """Compiled plan for the default schema plus any override file, recompiled when the file changes."""
+    path = os.environ.get(SCHEMA_OVERRIDE_ENV, SCHEMA_OVERRIDE_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    cache_key = (path, mtime)
+    if cache_key not in _plan_cache:
+        plan = None
+        if mtime is not None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    plan = ExtractionPlan(_merge_schema(EXTRACTION_SCHEMA, json.load(f)))
+            except (OSError, ValueError, KeyError, TypeError, sv.SelectorSyntaxError) as e:
+                # A broken override must not fail every scrape
+                warnings.warn(f"Ignoring scrape schema override {path}: {e}")
+        _plan_cache.clear()
+        _plan_cache[cache_key] = plan or ExtractionPlan(EXTRACTION_SCHEMA)
+    return _plan_cache[cache_key]
+
+
+def _build_product_data(fields):
+    """Assemble the product dict from raw extracted field values."""
+    product_data = {
+        'title': fields['title'] or '',
+        'price': fields['price'] or '',
+        'image_urls': [],
+        'specifications': {},
+        'reviews': [],
+        'rating_distribution': {'5': 0, '4': 0, '3': 0, '2': 0, '1': 0}
+    }
+
+    # Convert thumbnail URLs to full-size image URLs
+    for img_url in fields['images']:
+        img_url = IMAGE_SIZE_SUFFIX_RE.sub(r'.\1', img_url)
+        if not img_url.endswith('gif') and 'sprite' not in img_url:
+            if img_url not in product_data['image_urls']:
+                product_data['image_urls'].append(img_url)
+
+    main_img_url = fields['main_image']
+    if main_img_url and main_img_url not in product_data['image_urls']:
+        product_data['image_urls'].insert(0, main_img_url)
+
+    # Technical details table first
+    for row in fields['spec_rows']:
+        if row['key'] is not None and row['value'] is not None:
+            product_data['specifications'][row['key']] = row['value']
+
+    # Then the product information section
+    for section in fields['info_sections']:
+        # Handle detail bullets format
+        if section['list_item'] is not None:
+            if ':' in section['list_item']:
+                key, value = section['list_item'].split(':', 1)
+                product_data['specifications'][key.strip()] = value.strip()
+        # Handle table format
+        elif section['first_td'] is not None and len(section['cells']) >= 2:
+            key, value = section['cells'][0], section['cells'][1]
+            if key and value:
                 product_data['specifications'][key] = value
-        
-        # Try the product information section
-        info_sections = soup.select('#productOverview_feature_div table tr, #detailBullets_feature_div li, #feature-bullets li')
-        for section in info_sections:
-            # Handle detail bullets format
-            if section.select_one('.a-list-item'):
-                text = section.select_one('.a-list-item').text.strip()
-                if ':' in text:
-                    key, value = text.split(':', 1)
-                    product_data['specifications'][key.strip()] = value.strip()
-            # Handle table format
-            elif section.select_one('td'):
-                cells = section.select('td, th')
-                if len(cells) >= 2:
-                    key = cells[0].text.strip()
-                    value = cells[1].text.strip()
-                    if key and value:
-                        product_data['specifications'][key] = value
-        
-        # Try the feature bullets
-        feature_list = soup.select('#feature-bullets ul li:not(.aok-hidden) span.a-list-item')
-        if feature_list:
-            product_data['specifications']['Key Features'] = [item.text.strip() for item in feature_list]
-        
-        # Extract rating distribution
-        rating_bars = soup.select('tr[data-hook="rating-distribution-row"]')
-        # Try the original method first
-        for bar in rating_bars:
-            rating = bar.select_one('td:first-child a')
-            percentage = bar.select_one('td:last-child span')
-            if rating and percentage:
-                rating_text = rating.text.strip().split()[0]
-                percentage_text = percentage.text.strip().replace('%', '')
-                try:
-                    product_data['rating_distribution'][rating_text] = float(percentage_text)
-                except ValueError:
-                    continue
-        
-        # If no ratings found, try the histogram table format
-        if all(v == 0 for v in product_data['rating_distribution'].values()):
-            histogram = soup.select('#histogramTable li a')
-            for rating_elem in histogram:
-                aria_label = rating_elem.get('aria-label', '')
-                if aria_label:
-                    match = re.search(r'(\d+) percent.*?(\d+) stars?', aria_label)
-                    if match:
-                        percentage = match.group(1)
-                        stars = match.group(2)
-                        product_data['rating_distribution'][stars] = float(percentage)
-
-        # Extract reviews with specific data-hook attributes from Amazon HTML structure
-        reviews = soup.select('div[data-hook="review"], li[id][data-hook="review"]')
-        for review in reviews[:10]:  # Increased limit to capture more reviews
+
+    if fields['key_features']:
+        product_data['specifications']['Key Features'] = fields['key_features']
+
+    # Rating distribution rows, falling back to the histogram table format
+    for row in fields['rating_rows']:
+        if row['stars'] is not None and row['percentage'] is not None:
+            rating_text = row['stars'].split()[0] if row['stars'].split() else ''
             try:
-                review_data = {
-                    'title': '',
-                    'content': '',
-                    'rating': '',
-                    'reviewer_name': '',
-                    'review_date': ''
-                }
-                
-                # Extract review title - look for review-title data-hook
-                title_elem = review.select_one('a[data-hook="review-title"], span[data-hook="review-title"]')
-                if title_elem:
-                    review_data['title'] = title_elem.text.strip()
-                
-                # Extract review content - look for review-body data-hook
-                content_elem = review.select_one('span[data-hook="review-body"]')
-                if content_elem:
-                    # Get the actual text content, which might be in a nested span
-                    text_span = content_elem.select_one('span')
-                    if text_span:
-                        review_data['content'] = text_span.text.strip()
-                    else:
-                        review_data['content'] = content_elem.text.strip()
-                
-                # Also check for collapsed review content
-                collapsed_elem = review.select_one('div[data-hook="review-collapsed"]')
-                if collapsed_elem and not review_data['content']:
-                    review_data['content'] = collapsed_elem.text.strip()
-                
-                # Extract rating - look for review-star-rating data-hook
-                rating_elem = review.select_one('i[data-hook="review-star-rating"], i[data-hook="cmps-review-star-rating"]')
-                if rating_elem:
-                    rating_text = rating_elem.text.strip()
-                    # Extract just the number from "X.X out of 5"
-                    rating_match = re.search(r'([\d.]+)\s*out of\s*\d', rating_text)
-                    if rating_match:
-                        review_data['rating'] = rating_match.group(1)
-                    else:
-                        review_data['rating'] = rating_text
-                
-                # Extract reviewer name - look for profile name
-                reviewer_elem = review.select_one('span.a-profile-name')
-                if reviewer_elem:
-                    review_data['reviewer_name'] = reviewer_elem.text.strip()
-                
-                # Extract date - look for review-date data-hook
-                date_elem = review.select_one('span[data-hook="review-date"]')
-                if date_elem:
-                    review_data['review_date'] = date_elem.text.strip()
-                
-                if any(value for value in review_data.values()):
-                    product_data['reviews'].append(review_data)
-            except Exception as e:
+                product_data['rating_distribution'][rating_text] = float(row['percentage'].replace('%', ''))
+            except ValueError:
                 continue
-        
+
+    if all(v == 0 for v in product_data['rating_distribution'].values()):
+        for aria_label in fields['histogram']:
+            match = HISTOGRAM_LABEL_RE.search(aria_label)
+            if match:
+                percentage, stars = match.group(1), match.group(2)
+                product_data['rating_distribution'][stars] = float(percentage)
+
+    for review in fields['reviews']:
+        review_data = {key: review.get(key) or '' for key in ('title', 'content', 'rating', 'reviewer_name', 'review_date')}
+        if any(value for value in review_data.values()):
+            product_data['reviews'].append(review_data)
+
+    return product_data
+
+
+def extract_asin(url):
+    """Amazon product ID from a product URL, or None if the URL has none."""
+    match = ASIN_RE.search(url)
+    return match.group(1).upper() if match else None
+
+
+def fetch_page(url):
+    response = requests.get(url, headers=HEADERS, timeout=FETCH_TIMEOUT)
+    return response.content
+
+
+def parse_page(content):
+    return BeautifulSoup(content, 'html.parser')
+
+
+def extract_product(soup, plan=None):
+    plan = plan or get_extraction_plan()
+    return _build_product_data(plan.extract(soup))
+
+
+def scrape_amazon(url):
+    try:
+        product_data = extract_product(parse_page(fetch_page(url)))
+        product_data['asin'] = extract_asin(url)
         return product_data
     except Exception as e:
-        return {'error': str(e)}
\ No newline at end of file
+        return {'error': str(e)}
+
+
+def _synthetic_page(num_reviews=10, num_specs=40, num_filler=2000):
+    """Amazon-like product page used by the extraction benchmark."""
+    specs = ''.join(f"<tr><th>Spec {i}</th><td>Value {i}</td></tr>" for i in range(num_specs))
+    bullets = ''.join(f"<li><span class='a-list-item'>Feature {i}: detail {i}</span></li>" for i in range(8))
+    ratings = ''.join(
+        f"<tr data-hook='rating-distribution-row'><td><a>{stars} star</a></td><td><div></div></td><td><span>{pct}%</span></td></tr>"
+        for stars, pct in [(5, 60), (4, 20), (3, 10), (2, 5), (1, 5)]
+    )
+    reviews = ''.join(
+        f"<div data-hook='review' id='R{i}'>"
+        f"<span class='a-profile-name'>Reviewer {i}</span>"
+        f"<i data-hook='review-star-rating'><span>{1 + i % 5}.0 out of 5 stars</span></i>"
+        f"<a data-hook='review-title'><span>Review title {i}</span></a>"
+        f"<span data-hook='review-date'>Reviewed in India on 1 January 2025</span>"
+        f"<span data-hook='review-body'><span>Great phone, battery lasts all day. {i}</span></span>"
+        "</div>"
+        for i in range(num_reviews)
+    )
+    filler = ''.join(f"<div class='nav-item'><a href='#'><span>Link {i}</span></a></div>" for i in range(num_filler))
+    images = ''.join(f"<li><img src='https://m.media-amazon.com/images/I/img{i}._AC_US40_.jpg'></li>" for i in range(6))
+    return (
+        "<html><body>"
+        f"<div id='nav'>{filler}</div>"
+        "<span id='productTitle'> Benchmark Phone | 5G </span>"
+        "<span class='a-price-whole'>24,999</span>"
+        f"<div id='altImages'><ul>{images}</ul></div>"
+        "<div id='imageBlock'><img id='landingImage' src='https://m.media-amazon.com/images/I/main.jpg'></div>"
+        f"<div id='feature-bullets'><ul>{bullets}</ul></div>"
+        f"<table id='productDetails_techSpec_section_1'>{specs}</table>"
+        f"<table id='histogramTable'>{ratings}</table>"
+        f"<div id='cm-cr-dp-review-list'>{reviews}</div>"
+        "</body></html>"
+    )
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            page = f.read()
+    else:
+        page = _synthetic_page()
+
+    soup = parse_page(page)
+    plan = get_extraction_plan()
+    runs = 20
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        product = extract_product(soup, plan)
+    extract_ms = (time.perf_counter() - start) / runs * 1000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        parse_page(page)
+    parse_ms = (time.perf_counter() - start) / runs * 1000
+
+    print(f"Elements: {len(soup.find_all(True))}")
+    print(f"Parse time per page:      {parse_ms:.2f} ms")
+    print(f"Extraction time per page: {extract_ms:.2f} ms")
+    print(f"Specs: {len(product['specifications'])}, reviews: {len(product['reviews'])}, images: {len(product['image_urls'])}")
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from aspects import AspectEngine, KeywordAutomaton
+
+KEYWORDS = {
+    'battery': 'battery',
+    'battery life': 'battery',
+    'charge': 'battery',
+    'he': 'short',
+    'she': 'short',
+    'hers': 'short',
+    'his': 'short',
+    'screen': 'display',
+    'display': 'display',
+}
+
+
+def _brute_force(keywords, text, whole_words):
+    matches = []
+    for keyword, label in keywords.items():
+        start = text.find(keyword)
+        while start != -1:
+            end = start + len(keyword)
+            inside_word = (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum())
+            if not (whole_words and inside_word):
+                matches.append((start, end, label))
+            start = text.find(keyword, start + 1)
+    return sorted(matches)
+
+
+@pytest.mark.parametrize('whole_words', [True, False])
+def test_automaton_matches_brute_force(whole_words):
+    automaton = KeywordAutomaton(KEYWORDS, whole_words=whole_words)
+    rng = random.Random(7)
+    vocabulary = ['battery', 'life', 'charger', 'charge', 'ushers', 'she', 'his', 'screens', 'display', 'a', 'x']
+    texts = ['ushers', 'he said she has his battery life', 'batterybattery life']
+    texts += [rng.choice(['', ' ', '.']).join(rng.choices(vocabulary, k=12)) for _ in range(200)]
+
+    for text in texts:
+        expected = _brute_force(KEYWORDS, text, whole_words)
+        assert sorted(automaton.iter_matches(text)) == expected, text
+
+
+def test_matches_are_ordered_by_end():
+    automaton = KeywordAutomaton(KEYWORDS, whole_words=False)
+    ends = [end for _, end, _ in automaton.iter_matches('ushers charge the display')]
+    assert ends == sorted(ends)
+
+
+def test_labels_in_first_appearance_order():
+    automaton = KeywordAutomaton(KEYWORDS)
+    assert automaton.labels_in('the screen is great and the battery lasts, nice display') == ['display', 'battery']
+    assert automaton.labels_in('nothing relevant') == []
+
+
+def _engine(calls, scores):
+    def score_sentences(sentences):
+        calls.append(list(sentences))
+        return [scores.get(sentence.strip(), 0.0) for sentence in sentences]
+
+    return AspectEngine({'battery': ['battery', 'battery life'], 'display': ['screen', 'display']}, score_sentences)
+
+
+def test_engine_scores_all_sentences_in_one_call():
+    calls = []
+    engine = _engine(calls, {'The battery is great.': 0.8, 'The screen is dim.': -0.6,
+                             'Battery and display are fine.': 0.3})
+    results = engine.analyze([
+        'The battery is great. The screen is dim.',
+        'Battery and display are fine. Shipping was slow.',
+    ])
+
+    assert len(calls) == 1
+    assert [sentence.strip() for sentence in calls[0]] == ['The battery is great.', 'The screen is dim.', 'Battery and display are fine.']
+    assert results['battery'] == {'mentions': 2, 'sentences': 2, 'compound': pytest.approx(0.55),
+                                  'positive': 2, 'negative': 0}
+    assert results['display'] == {'mentions': 2, 'sentences': 2, 'compound': pytest.approx(-0.15),
+                                  'positive': 1, 'negative': 1}
+
+
+def test_overlapping_keywords_count_one_mention():
+    calls = []
+    results = _engine(calls, {}).analyze(['Battery life is long. Battery battery.'])
+
+    # "battery life" overlaps "battery" and counts once; the two later words are separate mentions
+    assert results['battery']['mentions'] == 3
+    assert results['battery']['sentences'] == 2
+
+
+def test_engine_skips_scoring_without_mentions():
+    calls = []
+    assert _engine(calls, {}).analyze(['Fast delivery.', '']) == {}
+    assert calls == []
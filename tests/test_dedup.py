@@ -0,0 +1,61 @@
+from dedup import MIN_SHINGLES, deduplicate_reviews, shingle
+
+LONG_REVIEW = 'The battery easily lasts two days and the display stays bright outdoors in full sun.'
+
+
+def _review(content, rating='5'):
+    return {'title': 'Review', 'content': content, 'rating': rating}
+
+
+def test_copies_with_the_same_rating_collapse_to_the_first():
+    reviews = [_review(LONG_REVIEW), _review(LONG_REVIEW), _review(LONG_REVIEW.upper() + '!!')]
+
+    kept, report = deduplicate_reviews(reviews)
+
+    assert kept == [reviews[0]]
+    assert report == {'total': 3, 'kept': 1, 'collapsed': 2, 'groups': 1}
+
+
+def test_copies_with_different_ratings_are_kept():
+    reviews = [_review(LONG_REVIEW, '5'), _review(LONG_REVIEW, '1')]
+
+    kept, report = deduplicate_reviews(reviews)
+
+    assert kept == reviews
+    assert report['collapsed'] == 0
+
+
+def test_short_generic_reviews_are_never_collapsed():
+    reviews = [
+        _review('Good product', '5'), _review('Good product', '1'),
+        _review('Nice', '4'), _review('nice!', '2'),
+        _review('Good product', '5'), _review('Value for money', '4'), _review('Value for money', '4'),
+    ]
+    assert all(shingle(review['content']).size < MIN_SHINGLES for review in reviews)
+
+    kept, report = deduplicate_reviews(reviews)
+
+    assert kept == reviews
+    assert report == {'total': 7, 'kept': 7, 'collapsed': 0, 'groups': 0}
+
+
+def test_distinct_reviews_are_kept_and_groups_are_counted():
+    other = 'Camera struggles in low light and the speaker crackles at high volume after a week.'
+    reviews = [
+        _review(LONG_REVIEW), _review(other, '2'), _review(LONG_REVIEW),
+        _review(other, '2'), _review(other, '2'), _review(''),
+    ]
+
+    kept, report = deduplicate_reviews(reviews)
+
+    assert kept == [reviews[0], reviews[1], reviews[5]]
+    assert report == {'total': 6, 'kept': 3, 'collapsed': 3, 'groups': 2}
+
+
+def test_heavy_duplication_stays_fast():
+    reviews = [_review(LONG_REVIEW)] * 4000
+
+    kept, report = deduplicate_reviews(reviews)
+
+    assert len(kept) == 1
+    assert report['collapsed'] == 3999
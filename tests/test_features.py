@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import analyzer
+from analyzer import FEATURE_ANCHORS
+
+CATEGORIES = list(FEATURE_ANCHORS)
+SPEC_KEYWORDS = {
+    'battery': ['battery', 'mah', 'charging'],
+    'display': ['display', 'screen'],
+    'camera': ['camera'],
+    'chipset': ['processor', 'chipset'],
+    'memory': ['ram', 'storage'],
+    'design': ['weight', 'build'],
+    'connectivity': ['wi-fi', 'usb', 'bluetooth'],
+}
+STRONG_WORDS = ['6000', 'amoled', '120hz', '108', 'snapdragon', '12 gb', 'ip68', '5g']
+WEAK_WORDS = ['3000', 'lcd', '60hz', '8 mp', 'quad core', '2 gb', 'plastic', 'micro usb']
+
+
+def _stub_vector(text):
+    """Embedding with a large shared component, like raw BERT, plus category and polarity axes."""
+    vector = np.zeros(len(CATEGORIES) + 2, dtype=np.float32)
+    vector[0] = 2.0
+    polarity = None
+    for category_id, (category, anchors) in enumerate(FEATURE_ANCHORS.items()):
+        if text in anchors['positive'] or text in anchors['negative']:
+            vector[1 + category_id] = 1.0
+            polarity = 1.0 if text in anchors['positive'] else -1.0
+    if polarity is None:
+        lowered = text.lower()
+        for category_id, category in enumerate(CATEGORIES):
+            if any(keyword in lowered for keyword in SPEC_KEYWORDS[category]):
+                vector[1 + category_id] = 1.0
+        polarity = (any(word in lowered for word in STRONG_WORDS) - any(word in lowered for word in WEAK_WORDS))
+    vector[-1] = 0.5 * polarity
+    return vector
+
+
+@pytest.fixture(autouse=True)
+def stub_embeddings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(analyzer, 'get_bert_embeddings_batch', lambda texts: np.stack([_stub_vector(t) for t in texts]))
+    monkeypatch.setattr(analyzer, '_anchor_matrix', None)
+    monkeypatch.setattr(analyzer, '_spec_embedding_cache', OrderedDict())
+
+
+def test_specs_are_assigned_to_their_category():
+    best_category, weights, _ = analyzer.match_spec_categories([
+        'Battery: 6000 mAh', 'Display: 6.7 inch AMOLED', 'Camera: 8 MP', 'ASIN: B0ABCDEF12',
+    ])
+
+    assert [CATEGORIES[i] for i in best_category[:3]] == ['battery', 'display', 'camera']
+    assert (weights[:3] > 0).all()
+    assert weights[3] == 0
+
+
+def test_unrelated_specs_give_a_neutral_score():
+    specs = {'ASIN': 'B0ABCDEF12', 'Manufacturer': 'Acme Electronics', 'Country of Origin': 'India'}
+
+    assert analyzer.analyze_features(specs) == 50
+    assert analyzer.analyze_features({}) == 50
+    assert analyzer.analyze_features({'Colour': ' '}) == 50
+
+
+def test_strong_specs_outscore_weak_specs():
+    strong = analyzer.analyze_features({
+        'Battery': '6000 mAh', 'Display': '6.7 inch AMOLED 120Hz', 'Processor': 'Snapdragon 8 Gen 2',
+    })
+    weak = analyzer.analyze_features({
+        'Battery': '3000 mAh', 'Display': 'HD+ LCD 60Hz', 'Processor': 'quad core 1.3 GHz',
+    })
+
+    assert strong > 50 > weak
+
+
+def test_unrelated_specs_do_not_dilute_the_score():
+    strong = {'Battery': '6000 mAh', 'Camera': '108 MP'}
+    with_noise = dict(strong, **{'ASIN': 'B0ABCDEF12', 'Country of Origin': 'India'})
+
+    assert analyzer.analyze_features(with_noise) == pytest.approx(analyzer.analyze_features(strong))
+
+
+def test_cutoff_is_calibrated_on_the_anchors():
+    anchors, category_ids, _ = analyzer.load_anchor_matrix()
+
+    cutoff = analyzer.calibrate_relevance_cutoff(anchors, category_ids)
+
+    assert 0 < cutoff < 1
@@ -0,0 +1,111 @@
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from image_cache import ImageCache
+
+
+def _png(width, height, color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+IMAGES = {
+    '/wide.png': _png(1200, 600, 'red'),
+    '/tall.png': _png(300, 900, 'blue'),
+}
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        body = IMAGES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for the image CDN that records every requested path."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _ImageHandler)
+    httpd.hits = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_variants_are_downscaled_from_one_download(server, tmp_path):
+    cache = ImageCache(str(tmp_path))
+    url = _url(server, '/wide.png')
+
+    thumb = cache.get(url, 'thumb')
+    display = cache.get(url, 'display')
+
+    assert server.hits == ['/wide.png']
+    assert Image.open(thumb).size == (160, 80)
+    assert Image.open(display).size == (640, 320)
+    assert cache.is_cached(url)
+    with pytest.raises(ValueError):
+        cache.get(url, 'poster')
+
+
+def test_least_recently_used_image_is_evicted(server, tmp_path):
+    wide, tall = _url(server, '/wide.png'), _url(server, '/tall.png')
+    probe = ImageCache(str(tmp_path / 'probe'))
+    probe.cache_url(wide)
+    # Room for one image's variants but not two
+    cache = ImageCache(str(tmp_path / 'cache'), max_bytes=probe.total_bytes + 1)
+
+    assert cache.cache_url(wide)
+    assert cache.cache_url(tall)
+
+    assert not cache.is_cached(wide)
+    assert cache.is_cached(tall)
+    assert cache.total_bytes <= cache.max_bytes
+    assert sorted(p.name for p in (tmp_path / 'cache').iterdir()) == sorted(
+        cache._filename(tall, variant) for variant in cache.variants
+    )
+
+
+def test_failed_download_falls_back_without_retrying(server, tmp_path):
+    cache = ImageCache(str(tmp_path), failed_retry_interval=0.2)
+    url = _url(server, '/missing.png')
+
+    assert cache.get(url) is None
+    assert cache.get(url, 'thumb') is None
+    assert server.hits == ['/missing.png']
+
+    time.sleep(0.3)
+    assert cache.get(url) is None
+    assert server.hits == ['/missing.png', '/missing.png']
+
+
+def test_index_is_rebuilt_from_disk(server, tmp_path):
+    url = _url(server, '/tall.png')
+    ImageCache(str(tmp_path)).cache_url(url)
+
+    reopened = ImageCache(str(tmp_path))
+
+    assert reopened.is_cached(url)
+    assert reopened.get(url, 'thumb') is not None
+    assert server.hits == ['/tall.png']
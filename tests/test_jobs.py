@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from jobs import JobManager
+from pipeline import AnalysisCancelled
+
+URL = 'https://www.amazon.in/dp/B0TESTJOB1'
+
+
+class _BlockingAnalysis:
+    """Stand-in for analyze_product that holds every run in its fetching stage until released."""
+
+    def __init__(self):
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, url, on_stage=None):
+        self.calls += 1
+        on_stage('fetching')
+        self.started.release()
+        self.release.wait(5)
+        on_stage('parsing')
+        return {'url': url, 'data': {'title': 'Test'}, 'score_details': None, 'summary': ''}
+
+
+@pytest.fixture
+def analysis():
+    analysis = _BlockingAnalysis()
+    yield analysis
+    analysis.release.set()
+
+
+def _wait(job):
+    job.future.result(timeout=5)
+
+
+def test_cancel_then_resubmit_starts_a_new_job(analysis):
+    manager = JobManager(analyze=analysis)
+    first = manager.submit(URL, 'session-a')
+    assert analysis.started.acquire(timeout=5)
+
+    assert manager.cancel(first.key, 'session-a')
+    assert first.status == 'running'
+
+    second = manager.submit(URL, 'session-a')
+    assert second is not first
+    assert manager.get(first.key) is second
+
+    analysis.release.set()
+    _wait(first)
+    _wait(second)
+    assert first.status == 'cancelled'
+    assert second.status == 'done'
+    assert second.succeeded
+    assert analysis.calls == 2
+
+
+def test_shared_job_runs_until_its_last_waiter_cancels(analysis):
+    manager = JobManager(analyze=analysis)
+    job = manager.submit(URL, 'session-a')
+    assert manager.submit(URL, 'session-b') is job
+    assert analysis.started.acquire(timeout=5)
+
+    assert not manager.cancel(job.key, 'session-a')
+    assert not job.cancel_requested
+    assert manager.cancel(job.key, 'session-b')
+
+    analysis.release.set()
+    _wait(job)
+    assert job.status == 'cancelled'
+    assert analysis.calls == 1
+
+
+def test_finished_job_is_reused_by_later_sessions(analysis):
+    manager = JobManager(analyze=analysis)
+    analysis.release.set()
+    job = manager.submit(URL, 'session-a')
+    _wait(job)
+
+    assert manager.submit(URL, 'session-b') is job
+    assert analysis.calls == 1
+    assert not manager.cancel(job.key, 'session-b')
+    assert job.status == 'done'
+
+
+def test_stage_callback_raises_once_cancelled():
+    manager = JobManager(analyze=lambda url, on_stage=None: {})
+    job = manager.submit(URL, 'session-a')
+    _wait(job)
+    job.cancel()
+    with pytest.raises(AnalysisCancelled):
+        job.enter_stage('scoring')
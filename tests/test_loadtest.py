@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import loadtest
+
+
+def test_sample_product_is_written_for_the_chatbot(tmp_path):
+    path = tmp_path / 'product_data.json'
+    loadtest.write_sample_product(str(path), num_reviews=7, num_specs=3)
+
+    product = json.loads(path.read_text(encoding='utf-8'))
+    assert len(product['reviews']) == 7
+    assert len(product['specifications']) == 3
+    assert len(product['image_urls']) == 6
+
+
+def test_load_test_reports_every_turn():
+    report = loadtest.run_load_test(sessions=3, turns=2, latency=0, tokens_per_second=0, num_reviews=5)
+
+    assert report['turns'] == 6
+    assert report['errors'] == 0
+    assert set(report['stages_ms']) == set(loadtest.APP_STAGES + ['model_call'])
+
+
+def test_turns_that_raise_count_as_errors(monkeypatch):
+    calls = []
+    generate_response = loadtest.generate_response
+
+    def flaky_response(question, path, model_factory, timings):
+        calls.append(question)
+        if len(calls) % 2:
+            raise RuntimeError('model exploded')
+        return generate_response(question, path=path, model_factory=model_factory, timings=timings)
+
+    monkeypatch.setattr(loadtest, 'generate_response', flaky_response)
+    report = loadtest.run_load_test(sessions=1, turns=4, latency=0, tokens_per_second=0, num_reviews=5)
+
+    assert report['turns'] == 4
+    assert report['errors'] == 2
+    assert report['latency_ms']
+
+
+def test_exceptions_outside_a_turn_are_not_swallowed(monkeypatch):
+    def broken_session(*args):
+        raise RuntimeError('session setup failed')
+
+    monkeypatch.setattr(loadtest, 'run_session', broken_session)
+    with pytest.raises(RuntimeError, match='session setup failed'):
+        loadtest.run_load_test(sessions=2, turns=1, latency=0, tokens_per_second=0, num_reviews=5)
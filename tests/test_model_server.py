@@ -0,0 +1,108 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import analyzer
+import model_server
+from model_server import (
+    MODEL_SERVER_ENV, MODEL_TIMEOUT_ENV, MicroBatcher, ModelClient, ModelServerError, ModelServerUnavailable,
+    ThreadingTCPModelServer, _RequestHandler,
+)
+
+
+def _lengths(texts):
+    if not all(isinstance(text, str) for text in texts):
+        raise TypeError('texts must be strings')
+    return [[float(len(text))] for text in texts]
+
+
+def test_micro_batcher_joins_concurrent_requests():
+    batcher = MicroBatcher(_lengths, max_batch_size=64, max_wait=0.2)
+    futures = [batcher.submit(['a' * i, 'b']) for i in range(1, 6)]
+
+    assert [future.result(5) for future in futures] == [[[float(i)], [1.0]] for i in range(1, 6)]
+    assert batcher.batches == 1
+    assert (batcher.requests, batcher.texts) == (5, 10)
+
+
+def test_micro_batcher_starts_a_new_batch_when_full():
+    batcher = MicroBatcher(_lengths, max_batch_size=4, max_wait=0.2)
+    futures = [batcher.submit(['x', 'y']) for _ in range(4)]
+
+    for future in futures:
+        future.result(5)
+    assert batcher.batches == 2
+
+
+def test_micro_batcher_fails_only_the_bad_request():
+    batcher = MicroBatcher(_lengths, max_batch_size=64, max_wait=0.2)
+    good, bad, other = batcher.submit(['ok']), batcher.submit([None]), batcher.submit(['fine'])
+
+    assert good.result(5) == [[2.0]]
+    assert other.result(5) == [[4.0]]
+    assert isinstance(bad.exception(5), TypeError)
+
+
+@pytest.fixture
+def server():
+    """A TCP model server whose embed op returns text lengths and whose sentiment op is slow."""
+    def slow_sentiment(texts):
+        time.sleep(0.5)
+        return [{'compound': 0.0} for _ in texts]
+
+    httpd = ThreadingTCPModelServer(('127.0.0.1', 0), _RequestHandler)
+    httpd.embed_batcher = MicroBatcher(_lengths, 64, 0.01)
+    httpd.sentiment_batcher = MicroBatcher(slow_sentiment, 64, 0.01)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"tcp:127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_client_round_trip_and_input_validation(server):
+    _, address = server
+    client = ModelClient(address)
+
+    assert np.array_equal(client.embed(['ab', 'c']), np.array([[2.0], [1.0]], dtype=np.float32))
+    with pytest.raises(ModelServerError, match='non-empty list of strings'):
+        client.request({'op': 'embed', 'texts': [None]})
+    assert client.available
+
+
+def test_slow_reply_is_an_error_not_a_fallback(server):
+    httpd, address = server
+    client = ModelClient(address, timeouts={'sentiment': 0.1})
+
+    with pytest.raises(ModelServerError) as raised:
+        client.sentiment(['slow'])
+    assert not isinstance(raised.value, ModelServerUnavailable)
+    assert client.available
+    time.sleep(0.6)
+    # The timed-out request was sent once, not resent
+    assert httpd.sentiment_batcher.requests == 1
+
+
+def test_unreachable_server_backs_off(tmp_path):
+    client = ModelClient(f"unix:{tmp_path / 'missing.sock'}")
+
+    with pytest.raises(ModelServerUnavailable):
+        client.embed(['text'])
+    assert not client.available
+    with pytest.raises(ModelServerUnavailable, match='unavailable'):
+        client.embed(['text'])
+
+
+def test_analyzer_falls_back_only_when_nothing_listens(server, tmp_path, monkeypatch):
+    _, address = server
+    monkeypatch.setattr(model_server, '_client', None)
+
+    monkeypatch.setenv(MODEL_SERVER_ENV, f"unix:{tmp_path / 'missing.sock'}")
+    assert analyzer.analyze_sentiment_batch(['Great phone']) == [analyzer.analyze_sentiment('Great phone')]
+
+    monkeypatch.setenv(MODEL_SERVER_ENV, address)
+    monkeypatch.setenv(MODEL_TIMEOUT_ENV, '0.1')
+    with pytest.raises(ModelServerError):
+        analyzer.analyze_sentiment_batch(['Great phone'])
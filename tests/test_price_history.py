@@ -0,0 +1,93 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+from price_history import COLUMNS, PriceHistoryStore, average_rating, parse_price
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceHistoryStore(root=str(tmp_path / 'history'))
+
+
+def _fill(store, asin, prices, start=1000, step=60):
+    for i, price in enumerate(prices):
+        store.append(asin, price, rating=4.0, timestamp=start + i * step)
+
+
+def test_parse_price():
+    assert parse_price('24,999.') == 24999
+    assert parse_price('₹1,23,456') == 123456
+    assert parse_price('') is None
+    assert parse_price(None) is None
+
+
+def test_average_rating():
+    assert average_rating({'5': 50.0, '4': 50.0}) == pytest.approx(4.5)
+    assert math.isnan(average_rating({}))
+    assert math.isnan(average_rating(None))
+
+
+def test_history_returns_window_inclusive(store):
+    _fill(store, 'B0TEST', [100, 110, 120, 130, 140])
+
+    history = store.history('B0TEST', start=1060, end=1180)
+    assert history['timestamp'].tolist() == [1060, 1120, 1180]
+    assert history['price'].tolist() == [110, 120, 130]
+    assert history['rating'].dtype == np.float32
+    assert store.history('B0MISSING')['price'].size == 0
+
+
+def test_history_thins_to_max_points(store):
+    _fill(store, 'B0TEST', list(range(100, 200)))
+
+    history = store.history('B0TEST', max_points=10)
+    assert len(history['price']) == 10
+    assert history['price'][0] == 100
+    assert np.all(np.diff(history['timestamp']) > 0)
+
+
+def test_stats_over_window(store):
+    _fill(store, 'B0TEST', [500, 100, 300, 200, 400])
+
+    stats = store.stats('B0TEST', start=1060)
+    assert stats['count'] == 4
+    assert (stats['min'], stats['max'], stats['latest']) == (100, 400, 400)
+    assert stats['p50'] == pytest.approx(250.0)
+    assert store.stats('B0TEST', start=5000) == {'count': 0}
+
+
+def test_record_skips_products_without_a_price(store):
+    assert store.record('B0TEST', {'price': '1,299', 'rating_distribution': {'5': 100.0}}, timestamp=1000)
+    assert not store.record('B0TEST', {'price': ''}, timestamp=1060)
+
+    history = store.history('B0TEST')
+    assert history['price'].tolist() == [1299]
+    assert history['rating'].tolist() == [5.0]
+
+
+def test_out_of_order_timestamp_is_moved_to_the_last_sample(store):
+    _fill(store, 'B0TEST', [100, 110])
+    store.append('B0TEST', 90, timestamp=500)
+
+    history = store.history('B0TEST')
+    assert history['timestamp'].tolist() == [1000, 1060, 1060]
+    assert history['price'].tolist() == [100, 110, 90]
+
+
+def test_partial_write_is_realigned(store):
+    _fill(store, 'B0TEST', [100, 110])
+    # Simulate a crash after the timestamp column was written but before the others
+    with open(store._column_path('B0TEST', 'timestamp'), 'ab') as f:
+        f.write(np.array([1120], dtype=COLUMNS['timestamp']).tobytes())
+
+    assert store.history('B0TEST')['price'].tolist() == [100, 110]
+
+    store.append('B0TEST', 130, timestamp=1180)
+    history = store.history('B0TEST')
+    assert history['timestamp'].tolist() == [1000, 1060, 1180]
+    assert history['price'].tolist() == [100, 110, 130]
+    for column, dtype in COLUMNS.items():
+        assert os.path.getsize(store._column_path('B0TEST', column)) == 3 * np.dtype(dtype).itemsize
@@ -0,0 +1,127 @@
+import json
+import os
+
+import pytest
+
+import scrape
+from scrape import EXTRACTION_SCHEMA, ExtractionPlan, extract_asin, extract_product, get_extraction_plan, parse_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def _product(name, plan=None):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return extract_product(parse_page(f.read()), plan)
+
+
+@pytest.fixture(autouse=True)
+def default_schema(tmp_path, monkeypatch):
+    """Point the override lookup at a file that does not exist unless a test writes it."""
+    monkeypatch.setenv(scrape.SCHEMA_OVERRIDE_ENV, str(tmp_path / 'scrape_schema.json'))
+    scrape._plan_cache.clear()
+    yield tmp_path / 'scrape_schema.json'
+    scrape._plan_cache.clear()
+
+
+def test_title_price_and_images():
+    product = _product('product_detail_bullets.html')
+
+    assert product['title'] == 'Acme Phone 5G (Midnight Black, 8GB RAM) | 6000 mAh Battery'
+    assert product['price'] == '24,999.'
+    # Size suffixes are stripped, duplicates dropped, GIFs and sprites skipped, main image first
+    assert product['image_urls'] == [
+        'https://m.media-amazon.com/images/I/main-image.jpg',
+        'https://m.media-amazon.com/images/I/alt-one.jpg',
+        'https://m.media-amazon.com/images/I/alt-two.png',
+    ]
+
+
+def test_detail_bullets_overview_table_and_key_features():
+    specs = _product('product_detail_bullets.html')['specifications']
+
+    assert specs == {
+        'Brand': 'Acme',
+        'Operating System': 'Android 14',
+        'Display': '6.7 inch AMOLED, 120Hz',
+        'Hidden': 'not shown',
+        'Item Weight': '195 g',
+        'Country of Origin': 'India',
+        'Key Features': ['Display: 6.7 inch AMOLED, 120Hz', 'All-day battery with fast charging'],
+    }
+
+
+def test_technical_details_table():
+    specs = _product('product_tech_table.html')['specifications']
+
+    assert specs == {'Processor': 'Intel Core i5', 'RAM Memory Installed Size': '16 GB', 'ASIN': 'B0TESTLAP1'}
+
+
+def test_rating_rows_and_histogram_fallback():
+    assert _product('product_tech_table.html')['rating_distribution'] == {
+        '5': 55.0, '4': 25.0, '3': 10.0, '2': 4.0, '1': 6.0,
+    }
+    # No rating rows on this page, so the histogram aria labels are used
+    assert _product('product_detail_bullets.html')['rating_distribution'] == {
+        '5': 64.0, '4': 18.0, '3': 8.0, '2': 3.0, '1': 7.0,
+    }
+
+
+def test_reviews_are_limited_to_ten():
+    reviews = _product('product_detail_bullets.html')['reviews']
+
+    assert len(reviews) == 10
+    assert [review['reviewer_name'] for review in reviews] == [f"Reviewer {i}" for i in range(10)]
+    assert reviews[0] == {
+        'title': 'Review title 0',
+        'content': 'Review body 0: the battery lasts all day.',
+        'rating': '1.0',
+        'reviewer_name': 'Reviewer 0',
+        'review_date': 'Reviewed in India on 1 January 2025',
+    }
+
+
+def test_collapsed_and_empty_nested_review_bodies():
+    reviews = _product('product_detail_bullets.html')['reviews']
+
+    assert reviews[3]['content'] == 'Collapsed review text about the camera.'
+    # An empty nested span falls back to the outer body span's text
+    assert reviews[4]['content'] == 'Outer body text only.'
+
+
+def test_review_with_alternate_markup():
+    assert _product('product_tech_table.html')['reviews'] == [{
+        'title': 'Solid machine',
+        'content': 'Fast and quiet.',
+        'rating': '4.0',
+        'reviewer_name': 'Only Reviewer',
+        'review_date': '',
+    }]
+
+
+def test_override_file_replaces_selectors(default_schema):
+    default_schema.write_text(json.dumps({'price': {'selectors': ['#productTitle']}}))
+
+    assert _product('product_detail_bullets.html', get_extraction_plan())['price'].startswith('Acme Phone')
+
+
+@pytest.mark.parametrize('override', [
+    '{"price": {"post": "no_such_processor"}}',
+    '{"title": {"selectors": ["div[data-hook="]}}',
+    '{"reviews": {"fields": {"title": {"selectors": "span"}}}}',
+    '{"price": ',
+])
+def test_invalid_override_falls_back_to_default_schema(default_schema, override):
+    default_schema.write_text(override)
+
+    with pytest.warns(UserWarning, match='Ignoring scrape schema override'):
+        plan = get_extraction_plan()
+
+    assert _product('product_detail_bullets.html', plan) == _product(
+        'product_detail_bullets.html', ExtractionPlan(EXTRACTION_SCHEMA)
+    )
+
+
+def test_extract_asin():
+    assert extract_asin('https://www.amazon.in/Acme-Phone/dp/b0abcdef12/ref=sr_1_1?th=1') == 'B0ABCDEF12'
+    assert extract_asin('https://www.amazon.in/gp/product/B0ABCDEF12') == 'B0ABCDEF12'
+    assert extract_asin('https://www.amazon.in/s?k=phone') is None